@@ -1,9 +1,8 @@
 import streamlit as st
 import asyncio
-import aiohttp
 import json
-from spl_token_analysis import get_token_details_async, process_tokens_concurrently
-from spl_report_generator import create_pdf
+from spl_token_analysis import create_session, get_token_details_async, process_tokens_concurrently
+from spl_report_generator import create_pdf, create_pdfs_batch
 import tempfile
 import os
 import zipfile
@@ -132,7 +131,7 @@ with tab1:
     if analyze_button and token_address:
         with st.spinner("Analyzing token..."):
             async def get_token():
-                async with aiohttp.ClientSession() as session:
+                async with create_session() as session:
                     details, _ = await get_token_details_async(token_address, session)
                     return details
             
@@ -252,7 +251,7 @@ with tab2:
             status_text = st.empty()
             
             async def process_batch():
-                async with aiohttp.ClientSession() as session:
+                async with create_session() as session:
                     results = await process_tokens_concurrently(addresses, session)
                     for i, _ in enumerate(results, 1):
                         progress = i / len(addresses)
@@ -306,11 +305,13 @@ with tab2:
         with col3:
             with tempfile.TemporaryDirectory() as temp_dir:
                 zip_path = os.path.join(temp_dir, "token_analysis_pdfs.zip")
+                pdf_paths = create_pdfs_batch(
+                    [result for result in results if result['status'] == 'success'],
+                    temp_dir
+                )
                 with zipfile.ZipFile(zip_path, 'w') as zipf:
-                    for result in results:
-                        if result['status'] == 'success':
-                            pdf_path = create_pdf(result, temp_dir)
-                            zipf.write(pdf_path, os.path.basename(pdf_path))
+                    for pdf_path in pdf_paths:
+                        zipf.write(pdf_path, os.path.basename(pdf_path))
                 
                 with open(zip_path, "rb") as zip_file:
                     st.download_button(
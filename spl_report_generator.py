@@ -1,14 +1,134 @@
+import io
 import os
+import re
 import json
-from datetime import datetime
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Frame, PageTemplate
-from reportlab.pdfgen import canvas
-
-def create_styles():
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union
+
+# reportlab is imported inside the functions that render a memo, so importing
+# this module (e.g. for CLI help or from app.py) doesn't pay for loading it
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+# Static memo text
+CONFLICTS_TEXT = """<b>Conflicts Certification:</b> To the best of your knowledge, please confirm that you and your immediate family: (1) have not invested more than $1,000 in the asset or its issuer, (2) do not own more than 1% of the asset outstanding, and (3) do not have a personal relationship with the issuer's management, governing body, or owners. For wrapped assets, the underlying asset must be considered for the purpose of this conflict certification, unless: 1) the asset is a stablecoin; or 2) has a market cap of over $100 billion dollars. For multi-chain assets every version of the multi-chain asset must be counted together for the purpose of this conflict certification."""
+
+CONTEXT_TEXT = """<b>Solana SPL Token Review Context:</b> Solana tokens do not possess customizable code per 
+asset. Rather, a single "program" generates boiler template tokens with distinct states for each 
+newly created token. Therefore, examining the base program configurations is adequate for 
+reviewing all other tokens associated with it. The 'Token Program' adheres to standard 
+practices, undergoing thorough review and auditing procedures. Therefore, within this review 
+process, the focus remains on validating token configurations specific to tokens managed by the 
+trusted Token Program"""
+
+SPL_DESCRIPTION = """The token must be a standard Solana SPL Token (i.e. owned by the Token Program or Token
+2022 Program) to be eligible for umbrella approval."""
+
+FREEZE_DESCRIPTION = """A missing freeze authority means that it is set to null and therefore a permanently revoked privilege. This means that account blacklisting is not possible."""
+
+UPDATE_DESCRIPTION = """A missing Update Authority means that the token configuration can't be altered."""
+
+DELEGATE_DESCRIPTION = """Permanent Delegate means that it is set to null and therefore Therefore, no delegate can burn or transfer any amount of tokens."""
+
+FEES_DESCRIPTION = """Transaction fees are set to 0 and therefore no transaction fees are possible and send/receive token amounts are the same as expected."""
+
+TRANSFER_HOOK_DESCRIPTION = """A missing TransferHook means that it is set to null and therefore does not communicate with a custom program whenever this token is transferred."""
+
+CONFIDENTIAL_DESCRIPTION = """The confidential transfer is a non-anonymous, non-private transfer that publicly shares the source, destination, and token type, but uses zero-knowledge proofs to encrypt the amount of the transfer."""
+
+# Token-2022 risk checks: (field, check title, description key, assessment subject, values meaning "absent")
+_ABSENT_VALUES = ('None', None, '')
+_TOKEN2022_RISK_CHECKS = (
+    ('update_authority', 'No Update Authority', 'update_description', 'the update authority is', _ABSENT_VALUES),
+    ('permanent_delegate', 'No Permanent Delegate', 'delegate_description', 'the permanent delegate is', _ABSENT_VALUES),
+    ('transaction_fees', 'No Transaction Fees', 'fees_description', 'the transaction fees are', _ABSENT_VALUES + ('0', 0)),
+    ('transfer_hook', 'No Transfer Hook', 'transfer_hook_description', 'the transfer hook is', _ABSENT_VALUES),
+    ('confidential_transfers', 'No Confidential Transfers', 'confidential_description', 'the confidential transfers are', _ABSENT_VALUES),
+)
+
+# Values shown as missing; only compared against scalars (nested values are handled first)
+_MISSING_VALUES = frozenset(('N/A', None, ''))
+
+@dataclass(slots=True)
+class TokenReport:
+    """Token fields used by the memo, with missing values replaced by their display defaults"""
+    name: str = 'Unknown'
+    symbol: str = 'UNKNOWN'
+    address: str = ''
+    owner_program: str = ''
+    security_review: str = 'UNKNOWN'
+    freeze_authority: Optional[str] = None
+    update_authority: Optional[str] = None
+    permanent_delegate: Optional[str] = None
+    transaction_fees: Any = None
+    transfer_hook: Optional[str] = None
+    confidential_transfers: Optional[str] = None
+    reviewer_name: str = 'Noama Samreen'
+    confirmation_status: str = 'Confirmed'
+
+    def __post_init__(self):
+        if self.name in _MISSING_VALUES:
+            self.name = 'Unknown'
+        if self.symbol in _MISSING_VALUES:
+            self.symbol = 'UNKNOWN'
+        if self.security_review in _MISSING_VALUES:
+            self.security_review = 'UNKNOWN'
+        if self.owner_program is None:
+            self.owner_program = ''
+
+    @classmethod
+    def from_dict(cls, token_data: Dict) -> 'TokenReport':
+        """Build a report from an analysis result dict, ignoring fields the memo doesn't use"""
+        return cls(**{name: token_data[name] for name in cls.__slots__ if name in token_data})
+
+# Details table fields, in display order
+_BASE_FIELDS = ('owner_program', 'freeze_authority')
+_TOKEN2022_FIELDS = (
+    'update_authority',
+    'permanent_delegate',
+    'transaction_fees',
+    'transfer_hook',
+    'confidential_transfers',
+)
+
+# Details table labels; all of them fit on one line of the label column
+_FIELD_LABELS = {field: field.replace('_', ' ').title() for field in _BASE_FIELDS + _TOKEN2022_FIELDS}
+
+# Characters not allowed in memo filenames (\w matches the same letters and digits as str.isalnum)
+_FILENAME_SANITIZE = re.compile(r'[^\w \-().]+')
+
+# Additional details table layout
+ADDITIONAL_COL_WIDTHS = [2.5*72, 3.5*72]  # 2.5 and 3.5 inches, in points
+CELL_SIDE_PADDING = 6  # reportlab's default LEFTPADDING/RIGHTPADDING
+# Heights of single-line plain-string rows: line leading plus reportlab's default 3pt top and bottom padding
+DETAIL_HEADER_HEIGHT = 12 + 2*3  # Default leading for the 10pt header font
+DETAIL_ROW_HEIGHT = 14 + 2*3  # LEADING set in the additional table style
+
+def _build_styles():
+    """Build every paragraph and table style used by the memo, including per-status variants"""
+    from reportlab import rl_config
+
+    # Skip reportlab's per-attribute shape validation unless debugging
+    if not os.environ.get('SPL_DEBUG'):
+        rl_config.shapeChecking = 0
+
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.platypus import TableStyle
+
+    # Parse the hex colors once for every style below
+    green = colors.HexColor('#006400')
+    header_grey = colors.HexColor('#f0f0f0')
+    alt_row = colors.HexColor('#f9f9f9')
+    last_row = colors.HexColor('#f8f8f8')
+
     styles = getSampleStyleSheet()
     
     # Title style with better spacing and alignment
@@ -88,44 +208,295 @@ def create_styles():
         fontName='Helvetica',
         leftIndent=0
     )
+    
+    # Conflicts certification style
+    conflicts_style = ParagraphStyle(
+        'Conflicts',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=12,
+        leading=14,
+        alignment=4,
+        fontName='Helvetica'
+    )
+    
+    # Risk score style
+    risk_score_style = ParagraphStyle(
+        'RiskScore',
+        parent=styles['Normal'],
+        fontSize=11,
+        spaceAfter=6,
+        leading=14,
+        fontName='Helvetica'
+    )
+    
+    # Monospace cell style for nested (JSON) field values
+    mono_cell_style = ParagraphStyle(
+        'MonoCell',
+        parent=cell_style,
+        fontName='Courier',
+        fontSize=8,
+        leading=10
+    )
+    
+    # Recommendation styles keyed by security review status
+    recommendation_styles = {
+        status: ParagraphStyle(
+            'CustomRecommendation',
+            parent=context_style,
+            fontSize=12,
+            textColor=color
+        )
+        for status, color in (('PASSED', green), ('FAILED', colors.red))
+    }
+    
+    # Security review cell styles keyed by security review status
+    security_cell_styles = {
+        status: ParagraphStyle(
+            'SecurityCell',
+            parent=cell_style,
+            textColor=color,
+            fontName='Helvetica-Bold'
+        )
+        for status, color in (('PASSED', green), ('FAILED', colors.red), ('UNKNOWN', colors.black))
+    }
 
-    return styles, title_style, cell_style, context_style, header_style, risk_header_style, risk_subheader_style, risk_body_style
-
-def create_basic_table(data, cell_style):
-    """Create and style the basic information table"""
-    # Reduced table width (adjusted from 6 inches to 5 inches total)
-    table = Table(data, colWidths=[1.2*inch, 3.8*inch])
-    table.setStyle(TableStyle([
+    basic_table_style = TableStyle([
         ('ALIGN', (0,0), (-1,-1), 'LEFT'),
         ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
         ('FONTSIZE', (0,0), (-1,-1), 10),
         ('GRID', (0,0), (-1,-1), 1, colors.black),
         ('BACKGROUND', (0,0), (0,-1), colors.lightgrey),
         ('TEXTCOLOR', (0,0), (-1,-1), colors.black),
+        ('LEADING', (0,0), (-1,-1), 14),  # Match cell_style line spacing for plain-string cells
         ('PADDING', (0,0), (-1,-1), 6),
         ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-    ]))
-    return table
+    ])
 
-def create_additional_table(data, cell_style):
-    """Create and style the additional fields table"""
-    table = Table(data, colWidths=[2.5*inch, 3.5*inch])
-    table.setStyle(TableStyle([
+    additional_table_style = TableStyle([
         ('ALIGN', (0,0), (-1,-1), 'LEFT'),
         ('FONTNAME', (0,0), (-1,0), 'Helvetica-Bold'),  # Bold header row
         ('FONTNAME', (0,1), (-1,-1), 'Helvetica'),
         ('FONTSIZE', (0,0), (-1,-1), 10),
+        ('LEADING', (0,1), (-1,-1), 14),  # Match cell_style line spacing for plain-string rows
         ('GRID', (0,0), (-1,-1), 1, colors.black),
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor('#f0f0f0')),  # Light gray header
+        ('BACKGROUND', (0,0), (-1,0), header_grey),  # Light gray header
         ('TEXTCOLOR', (0,0), (-1,-1), colors.black),
         ('PADDING', (0,0), (-1,-1), 12),
         ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('ROWBACKGROUNDS', (0,1), (-1,-2), [colors.white, colors.HexColor('#f9f9f9')]),  # Alternating rows
-        ('BACKGROUND', (0,-1), (-1,-1), colors.HexColor('#f8f8f8')),  # Slight emphasis on last row
-    ]))
+        ('ROWBACKGROUNDS', (0,1), (-1,-2), [colors.white, alt_row]),  # Alternating rows
+        ('BACKGROUND', (0,-1), (-1,-1), last_row),  # Slight emphasis on last row
+    ])
+
+    reviewer_table_style = TableStyle([
+        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
+        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
+        ('FONTSIZE', (0,0), (-1,-1), 10),
+        ('GRID', (0,0), (-1,-1), 1, colors.black),
+        ('BACKGROUND', (0,0), (0,0), colors.lightgrey),
+        ('BACKGROUND', (2,0), (2,0), colors.lightgrey),
+        ('TEXTCOLOR', (0,0), (-1,-1), colors.black),
+        ('LEADING', (0,0), (-1,-1), 14),  # Match cell_style line spacing for plain-string cells
+        ('PADDING', (0,0), (-1,-1), 6),
+        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+    ])
+
+    return {
+        'title': title_style,
+        'cell': cell_style,
+        'mono_cell': mono_cell_style,
+        'context': context_style,
+        'header': header_style,
+        'risk_header': risk_header_style,
+        'risk_subheader': risk_subheader_style,
+        'risk_body': risk_body_style,
+        'conflicts': conflicts_style,
+        'risk_score': risk_score_style,
+        'recommendation': recommendation_styles,
+        'security_cell': security_cell_styles,
+        'basic_table': basic_table_style,
+        'additional_table': additional_table_style,
+        'reviewer_table': reviewer_table_style,
+    }
+
+@lru_cache(maxsize=1)
+def _get_styles():
+    """Return the memo styles, building them on first use"""
+    return _build_styles()
+
+_STATIC_PARA = None
+
+def _build_static_paragraphs(styles):
+    """Parse the memo text that never changes once, keyed by section"""
+    risk_body_style = styles['risk_body']
+    sources = {
+        'conflicts': (CONFLICTS_TEXT, styles['conflicts']),
+        'context': (CONTEXT_TEXT, styles['context']),
+        'risk_findings': ("Risk Findings", styles['risk_header']),
+        'assessment': ("<b>Assessment:</b>", risk_body_style),
+        'mitigations': ("<b>Mitigations:</b>", risk_body_style),
+        'no_mitigation': ("N/A", risk_body_style),
+        'spl_description': (SPL_DESCRIPTION, risk_body_style),
+        'freeze_description': (FREEZE_DESCRIPTION, risk_body_style),
+        'update_description': (UPDATE_DESCRIPTION, risk_body_style),
+        'delegate_description': (DELEGATE_DESCRIPTION, risk_body_style),
+        'fees_description': (FEES_DESCRIPTION, risk_body_style),
+        'transfer_hook_description': (TRANSFER_HOOK_DESCRIPTION, risk_body_style),
+        'confidential_description': (CONFIDENTIAL_DESCRIPTION, risk_body_style),
+    }
+    from reportlab.platypus import Paragraph
+
+    parsed = {}
+    for key, (text, style) in sources.items():
+        para = Paragraph(text, style)
+        parsed[key] = (para.text, para.style, para.frags)
+    return parsed
+
+@lru_cache(maxsize=1)
+def _static_paragraph_class():
+    """Return the Paragraph subclass used for static memo text, defined on first use"""
+    from reportlab.platypus import Paragraph
+
+    class StaticParagraph(Paragraph):
+        """Paragraph that reuses the line breaks of its text at a given width across memos"""
+        layout_key = None  # Unset on the pieces of a paragraph split across pages
+        _line_cache = {}
+
+        def breakLines(self, width):
+            if self.layout_key is None:
+                return Paragraph.breakLines(self, width)
+            cache_key = (self.layout_key, tuple(width) if isinstance(width, (list, tuple)) else width)
+            lines = self._line_cache.get(cache_key)
+            if lines is None:
+                lines = self._line_cache[cache_key] = Paragraph.breakLines(self, width)
+            return lines
+
+    return StaticParagraph
+
+def _static_paragraph(key):
+    """Return a fresh Paragraph for static memo text without re-parsing or re-wrapping it.
+
+    Flowables keep layout state after a build, so each memo gets its own
+    instance built from the cached fragments; only the computed line breaks,
+    which depend on nothing but the text, style and width, are shared.
+    """
+    global _STATIC_PARA
+    if _STATIC_PARA is None:
+        _STATIC_PARA = _build_static_paragraphs(_get_styles())
+    text, style, frags = _STATIC_PARA[key]
+    para = _static_paragraph_class()(text, style, frags=frags)
+    para.layout_key = key
+    return para
+
+_PLAIN_FRAGS = {}
+
+# Tags and entities are the only text the paragraph parser needs to interpret
+_HAS_MARKUP = re.compile(r'[<&]').search
+
+def _plain_paragraph(text, style):
+    """Return a Paragraph for text, skipping the markup parser when the text has no tags or entities"""
+    from reportlab.platypus import Paragraph
+    from reportlab.platypus.paragraph import cleanBlockQuotedText
+
+    text = cleanBlockQuotedText(text)
+    if not text or _HAS_MARKUP(text):
+        return Paragraph(text, style)
+    # A markup-free paragraph parses to one fragment carrying the style's font settings.
+    # This serves wrapping table cells, risk subheaders and risk assessment sentences;
+    # it is keyed by the style object because style names need not be unique
+    frag = _PLAIN_FRAGS.get(style)
+    if frag is None:
+        frag = _PLAIN_FRAGS[style] = Paragraph('x', style).frags[0]
+    return Paragraph(text, style, frags=[frag.clone(text=text)])
+
+def create_basic_table(data, cell_style):
+    """Create and style the basic information table"""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Table
+
+    # Reduced table width (adjusted from 6 inches to 5 inches total)
+    table = Table(data, colWidths=[1.2*inch, 3.8*inch])
+    table.setStyle(_get_styles()['basic_table'])
+    return table
+
+def create_additional_table(data, cell_style):
+    """Create and style the additional fields table"""
+    from reportlab.platypus import Table
+
+    # Plain-string rows get their known height so only rows holding flowables are measured
+    row_heights = [DETAIL_HEADER_HEIGHT] + [
+        DETAIL_ROW_HEIGHT if all(isinstance(cell, str) and '\n' not in cell for cell in row) else None
+        for row in data[1:]
+    ]
+    table = Table(data, colWidths=ADDITIONAL_COL_WIDTHS, rowHeights=row_heights, repeatRows=1)
+    table.setStyle(_get_styles()['additional_table'])
     return table
 
+def _table_cell(text, style, width):
+    """Return text as a plain table string when it fits on one line, else as a wrapping Paragraph"""
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    if '\n' not in text and stringWidth(text, style.fontName, style.fontSize) <= width:
+        return text
+    return _plain_paragraph(text, style)
+
+def _detail_value_cell(value, styles, width):
+    """Return the details table cell for a field value, showing missing values as 'None'"""
+    from reportlab.platypus import Preformatted
+
+    if isinstance(value, (dict, list)):
+        # Nested values are shown verbatim, without running them through the paragraph parser
+        return Preformatted(_format_json(value), styles['mono_cell'])
+    if value in _MISSING_VALUES:
+        value = 'None'
+    return _table_cell(str(value), styles['cell'], width)
+
+def _iter_detail_rows(report, field_order, styles):
+    """Yield the details table rows: header, fields in order, then the security review"""
+    yield ["Field", "Value"]
+    # Single-line values skip the paragraph parser
+    value_width = ADDITIONAL_COL_WIDTHS[1] - 2 * CELL_SIDE_PADDING
+    for field in field_order:
+        yield [_FIELD_LABELS[field], _detail_value_cell(getattr(report, field), styles, value_width)]
+    yield ["Security Review", report.security_review]
+
+def _format_json(value):
+    """Pretty-print a nested field value for the details table"""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(value, indent=2)
+
+@lru_cache(maxsize=1)
+def _format_review_date(day):
+    return day.strftime("%Y-%m-%d")
+
+def _today_str():
+    """Return today's review date, formatting it again only when the date changes"""
+    return _format_review_date(date.today())
+
+def _build_token2022_risk_sections(report, risk_subheader_style, risk_body_style):
+    """Build the header, description, assessment and mitigation flowables for each Token-2022 check"""
+    from reportlab.platypus import Spacer
+
+    elements = []
+    for field, title, description_key, subject, absent_values in _TOKEN2022_RISK_CHECKS:
+        value = getattr(report, field)
+        passed = value in absent_values
+        elements.extend([
+            _plain_paragraph(f"{'1' if passed else '5'} | {title} {'- Pass' if passed else '- Fail'}", risk_subheader_style),
+            _static_paragraph(description_key),
+            _static_paragraph('assessment'),
+            _plain_paragraph(f"As token metadata indicates, {subject}: {value}.", risk_body_style),
+            Spacer(1, 8),
+            _static_paragraph('mitigations'),
+            _static_paragraph('no_mitigation'),
+        ])
+    return elements
+
 def create_header(canvas, doc):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+
     canvas.saveState()
     # Set up the style for confidentiality notice
     canvas.setFont('Helvetica-Oblique', 8)
@@ -135,23 +506,13 @@ def create_header(canvas, doc):
         "Confidential treatment requested under NY Banking Law § 36.10 and NY Pub. Off. Law § 87.2(d).")
     canvas.restoreState()
 
-def create_pdf(token_data, output_dir):
-    """Generate PDF for a single token"""
-    # Handle missing or invalid name/symbol
-    token_name = token_data.get('name', 'Unknown')
-    if token_name in ['N/A', None, '']:
-        token_name = 'Unknown'
-    
-    token_symbol = token_data.get('symbol', 'UNKNOWN')
-    if token_symbol in ['N/A', None, '']:
-        token_symbol = 'UNKNOWN'
-    
-    filename = f"{token_name} ({token_symbol}) Security Memo.pdf"
-    filename = "".join(c for c in filename if c.isalnum() or c in (' ', '-', '_', '(', ')', '.'))
-    filepath = os.path.join(output_dir, filename)
-    
+def _make_doc(output):
+    """Create the memo document template, writing to output, with the confidentiality header"""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Frame, PageTemplate
+
     doc = SimpleDocTemplate(
-        filepath,
+        output,
         pagesize=letter,
         leftMargin=72,
         rightMargin=72,
@@ -173,8 +534,44 @@ def create_pdf(token_data, output_dir):
         onPage=create_header
     )
     doc.addPageTemplates([template])
-    
-    styles, title_style, cell_style, context_style, header_style, risk_header_style, risk_subheader_style, risk_body_style = create_styles()
+    return doc
+
+def _memo_filename(token_name, token_symbol):
+    """Build a filesystem-safe memo filename"""
+    filename = f"{token_name} ({token_symbol}) Security Memo.pdf"
+    return _FILENAME_SANITIZE.sub('', filename)
+
+def _write_file(path, data):
+    """Write data to path, replacing the file atomically so readers never see a partial PDF"""
+    # A per-process, per-thread name in the same directory, created with the usual permissions
+    temp_path = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    try:
+        # Buffered writes loop until every byte is written
+        with open(temp_path, 'wb') as temp_file:
+            temp_file.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+def _as_report(token_data):
+    """Return token_data as a TokenReport, converting analysis result dicts"""
+    return token_data if isinstance(token_data, TokenReport) else TokenReport.from_dict(token_data)
+
+def _token_flowables(report, styles):
+    """Build the flowables for one token's memo"""
+    from reportlab.lib.units import inch
+    from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
+
+    token_name, token_symbol = report.name, report.symbol
+    owner_program = report.owner_program
+    is_token_2022 = "Token 2022" in owner_program
+    
+    title_style = styles['title']
+    cell_style = styles['cell']
+    risk_subheader_style = styles['risk_subheader']
+    risk_body_style = styles['risk_body']
     elements = []
     
     # Title first
@@ -186,74 +583,48 @@ def create_pdf(token_data, output_dir):
     elements.append(Spacer(1, 20))
     
     # Basic information table (reviewer, profile, date, etc.)
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    profile = "SPL Token 2022 Standard" if "Token 2022" in token_data['owner_program'] else "SPL Token Standard"
+    current_date = _today_str()
+    profile = "SPL Token 2022 Standard" if is_token_2022 else "SPL Token Standard"
     
+    # Labels are plain strings styled by the table; values only wrap when too wide for the column
+    metadata_value_width = 3.8*inch - 2 * CELL_SIDE_PADDING
     metadata_data = [
-        [Paragraph("Reviewer", cell_style), Paragraph(token_data.get('reviewer_name', 'Noama Samreen'), cell_style)],
-        [Paragraph("Profile", cell_style), Paragraph(profile, cell_style)],
-        [Paragraph("Review Date", cell_style), Paragraph(current_date, cell_style)],
-        [Paragraph("Network", cell_style), Paragraph("Solana", cell_style)],
-        [Paragraph("Address", cell_style), Paragraph(token_data['address'], cell_style)]
+        ["Reviewer", _table_cell(report.reviewer_name, cell_style, metadata_value_width)],
+        ["Profile", profile],
+        ["Review Date", current_date],
+        ["Network", "Solana"],
+        ["Address", _table_cell(report.address, cell_style, metadata_value_width)]
     ]
     
     elements.append(create_basic_table(metadata_data, cell_style))
     elements.append(Spacer(1, 20))
     
     # Add conflicts certification
-    conflicts_style = ParagraphStyle(
-        'Conflicts',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=12,
-        leading=14,
-        alignment=4,
-        fontName='Helvetica'
-    )
-    conflicts_text = """<b>Conflicts Certification:</b> To the best of your knowledge, please confirm that you and your immediate family: (1) have not invested more than $1,000 in the asset or its issuer, (2) do not own more than 1% of the asset outstanding, and (3) do not have a personal relationship with the issuer's management, governing body, or owners. For wrapped assets, the underlying asset must be considered for the purpose of this conflict certification, unless: 1) the asset is a stablecoin; or 2) has a market cap of over $100 billion dollars. For multi-chain assets every version of the multi-chain asset must be counted together for the purpose of this conflict certification."""
-    elements.append(Paragraph(conflicts_text, conflicts_style))
+    elements.append(_static_paragraph('conflicts'))
     elements.append(Spacer(1, 10))
     
-    # Add reviewer confirmation (single row table)
+    # Add reviewer confirmation (single row table); the table style sets the font,
+    # so only values too wide for their column need a wrapping paragraph
+    reviewer_value_width = 2*inch - 2 * CELL_SIDE_PADDING
     reviewer_confirmation = [[
-        Paragraph("Reviewer:", cell_style), 
-        Paragraph(token_data.get('reviewer_name', 'Noama Samreen'), cell_style),
-        Paragraph("Status:", cell_style),
-        Paragraph(token_data.get('confirmation_status', 'Confirmed'), cell_style)
+        "Reviewer:",
+        _table_cell(report.reviewer_name, cell_style, reviewer_value_width),
+        "Status:",
+        _table_cell(report.confirmation_status, cell_style, reviewer_value_width)
     ]]
     
     # Create table with 4 columns for single-row layout
     reviewer_table = Table(reviewer_confirmation, colWidths=[1*inch, 2*inch, 1*inch, 2*inch])
-    reviewer_table.setStyle(TableStyle([
-        ('ALIGN', (0,0), (-1,-1), 'LEFT'),
-        ('FONTNAME', (0,0), (-1,-1), 'Helvetica'),
-        ('FONTSIZE', (0,0), (-1,-1), 10),
-        ('GRID', (0,0), (-1,-1), 1, colors.black),
-        ('BACKGROUND', (0,0), (0,0), colors.lightgrey),
-        ('BACKGROUND', (2,0), (2,0), colors.lightgrey),
-        ('TEXTCOLOR', (0,0), (-1,-1), colors.black),
-        ('PADDING', (0,0), (-1,-1), 6),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-    ]))
+    reviewer_table.setStyle(styles['reviewer_table'])
     elements.append(reviewer_table)
     elements.append(Spacer(1, 30))
     
     # Context text
-    context_text = """<b>Solana SPL Token Review Context:</b> Solana tokens do not possess customizable code per 
-asset. Rather, a single "program" generates boiler template tokens with distinct states for each 
-newly created token. Therefore, examining the base program configurations is adequate for 
-reviewing all other tokens associated with it. The 'Token Program' adheres to standard 
-practices, undergoing thorough review and auditing procedures. Therefore, within this review 
-process, the focus remains on validating token configurations specific to tokens managed by the 
-trusted Token Program"""
-    
-    elements.append(Paragraph(context_text, context_style))
+    elements.append(_static_paragraph('context'))
     elements.append(Spacer(1, 25))
     
     # Recommendation with error handling and risk scores
-    security_review = token_data.get('security_review', 'UNKNOWN')
-    if security_review in ['N/A', None, '']:
-        security_review = 'UNKNOWN'
+    security_review = report.security_review
     
     # Determine risk scores based on security review
     risk_score = 1 if security_review == 'PASSED' else 5
@@ -262,23 +633,12 @@ trusted Token Program"""
         f"<b>{token_name} ({token_symbol}) "
         f"{'is' if security_review == 'PASSED' else 'is not'} recommended for listing.</b>"
     )
-    elements.append(Paragraph(recommendation, ParagraphStyle(
-        'CustomRecommendation',
-        parent=context_style,
-        fontSize=12,
-        textColor=colors.HexColor('#006400') if security_review == 'PASSED' else colors.red
-    )))
+    recommendation_style = styles['recommendation']['PASSED' if security_review == 'PASSED' else 'FAILED']
+    elements.append(Paragraph(recommendation, recommendation_style))
     elements.append(Spacer(1, 15))
     
     # Add risk scores
-    risk_style = ParagraphStyle(
-        'RiskScore',
-        parent=styles['Normal'],
-        fontSize=11,
-        spaceAfter=6,
-        leading=14,
-        fontName='Helvetica'
-    )
+    risk_style = styles['risk_score']
     
     elements.append(Paragraph(
         f"<b>Residual Security Risk Score:</b> {risk_score}",
@@ -291,206 +651,145 @@ trusted Token Program"""
     elements.append(Spacer(1, 25))
     
     # Additional details table
-    additional_data = [["Field", "Value"]]
-    
-    # Base fields for all tokens
-    field_order = [
-        'owner_program',
-        'freeze_authority'
-    ]
-    
-    # Add Token 2022 specific fields if applicable
-    if "Token 2022" in token_data.get('owner_program', ''):
-        field_order.extend([
-            'update_authority',
-            'permanent_delegate',
-            'transaction_fees',
-            'transfer_hook',
-            'confidential_transfers'
-        ])
+    # Base fields for all tokens, plus Token 2022 specific fields if applicable
+    field_order = _BASE_FIELDS + _TOKEN2022_FIELDS if is_token_2022 else _BASE_FIELDS
     
     # Add pump.fun specific fields if applicable
    # if "Pump.Fun Mint Authority" in str(token_data.get('update_authority', '')):
-    #    field_order.extend([
+    #    field_order += (
     #        'is_genuine_pump_fun_token',
     #        'interacted_with',
     #        'token_graduated_to_raydium'
-    #    ])
+    #    )
     #    if token_data.get('interacting_account') or token_data.get('interaction_signature'):
-    #        field_order.extend([
+    #        field_order += (
     #            'interacting_account',
     #            'interaction_signature'
-    #        ])
-    
-    # Add fields in specified order
-    for field in field_order:
-        value = token_data.get(field, 'None')
-        if value in ['N/A', None, '']:
-            value = 'None'
-        if isinstance(value, bool):
-            value = str(value)
-        display_name = str(field).replace('_', ' ').title()
-        additional_data.append([
-            Paragraph(display_name, cell_style),
-            Paragraph(str(value), cell_style)
-        ])
-    
-    # Add security review as the last row
-    security_style = ParagraphStyle(
-        'SecurityCell',
-        parent=cell_style,
-        textColor=colors.HexColor('#006400') if security_review == 'PASSED' 
-                 else colors.red if security_review == 'FAILED'
-                 else colors.black,
-        fontName='Helvetica-Bold'
-    )
+    #        )
     
-    additional_data.append([
-        Paragraph("Security Review", cell_style),
-        Paragraph(security_review, security_style)
-    ])
+    # Security review is the last row, colored through the table style
+    security_style = styles['security_cell'].get(security_review, styles['security_cell']['UNKNOWN'])
     
-    elements.append(create_additional_table(additional_data, cell_style))
+    additional_data = list(_iter_detail_rows(report, field_order, styles))
+    additional_table = create_additional_table(additional_data, cell_style)
+    additional_table.setStyle(TableStyle([
+        ('FONTNAME', (1,-1), (1,-1), security_style.fontName),
+        ('TEXTCOLOR', (1,-1), (1,-1), security_style.textColor),
+    ]))
+    elements.append(additional_table)
     
     # After the details table, add Risk Findings section
     elements.append(Spacer(1, 30))
     
     # Risk Findings Header
-    elements.append(Paragraph("Risk Findings", risk_header_style))
+    elements.append(_static_paragraph('risk_findings'))
     
     # Standard SPL Token Check
-    is_valid_token_program = "Token Program" in token_data.get('owner_program', '') or "Token 2022" in token_data.get('owner_program', '')
+    is_valid_token_program = "Token Program" in owner_program or is_token_2022
     spl_header = f"""{'1' if is_valid_token_program else '5'} | Standard Solana SPL Token {'- Pass' if is_valid_token_program else '- Fail'}"""
     
-    elements.append(Paragraph(spl_header, risk_subheader_style))
+    elements.append(_plain_paragraph(spl_header, risk_subheader_style))
     
-    spl_description = """The token must be a standard Solana SPL Token (i.e. owned by the Token Program or Token
-2022 Program) to be eligible for umbrella approval."""
-    elements.append(Paragraph(spl_description, risk_body_style))
+    elements.append(_static_paragraph('spl_description'))
     elements.append(Spacer(1, 8))
     
     # Assessment
-    elements.append(Paragraph("<b>Assessment:</b>", risk_body_style))
-    owner_assessment = f"""As token metadata indicates, the token owner is the {token_data['owner_program']}."""
-    elements.append(Paragraph(owner_assessment, risk_body_style))
+    elements.append(_static_paragraph('assessment'))
+    owner_assessment = f"""As token metadata indicates, the token owner is the {owner_program}."""
+    elements.append(_plain_paragraph(owner_assessment, risk_body_style))
     elements.append(Spacer(1, 8))
     
     # Mitigations
-    elements.append(Paragraph("<b>Mitigations:</b>", risk_body_style))
-    elements.append(Paragraph("N/A", risk_body_style))
+    elements.append(_static_paragraph('mitigations'))
+    elements.append(_static_paragraph('no_mitigation'))
     
     # Freeze Authority Check
-    freeze_value = token_data.get('freeze_authority', 'None')
+    freeze_value = report.freeze_authority
     has_no_freeze = freeze_value == 'None' or freeze_value is None or freeze_value == ''
     freeze_header = f"""{'1' if has_no_freeze else '5'} | No Freeze Authority {'- Pass' if has_no_freeze else '- Fail'}"""
-    elements.append(Paragraph(freeze_header, risk_subheader_style))
+    elements.append(_plain_paragraph(freeze_header, risk_subheader_style))
     
-    freeze_description = """A missing freeze authority means that it is set to null and therefore a permanently revoked privilege. This means that account blacklisting is not possible."""
-    elements.append(Paragraph(freeze_description, risk_body_style))
+    elements.append(_static_paragraph('freeze_description'))
     elements.append(Spacer(1, 8))
     
     # Assessment
-    elements.append(Paragraph("<b>Assessment:</b>", risk_body_style))
-    elements.append(Paragraph(
+    elements.append(_static_paragraph('assessment'))
+    elements.append(_plain_paragraph(
         f"""As token metadata indicates, the freeze authority is: {freeze_value}.""",
         risk_body_style
     ))
     elements.append(Spacer(1, 8))
     
     # Mitigations
-    elements.append(Paragraph("<b>Mitigations:</b>", risk_body_style))
-    elements.append(Paragraph("N/A", risk_body_style))
+    elements.append(_static_paragraph('mitigations'))
+    elements.append(_static_paragraph('no_mitigation'))
     
     # Add Token 2022 specific checks if applicable
-    if "Token 2022" in token_data.get('owner_program', ''):
-        # Update Authority Check
-        update_value = token_data.get('update_authority', 'None')
-        has_no_update = update_value == 'None' or update_value is None or update_value == ''
-        update_header = f"""{'1' if has_no_update else '5'} | No Update Authority {'- Pass' if has_no_update else '- Fail'}"""
-        elements.append(Paragraph(update_header, risk_subheader_style))
-        update_description = """A missing Update Authority means that the token configuration can't be altered."""
-        elements.append(Paragraph(update_description, risk_body_style))
-        elements.append(Paragraph("<b>Assessment:</b>", risk_body_style))
-        elements.append(Paragraph(
-            f"""As token metadata indicates, the update authority is: {update_value}.""",
-            risk_body_style
-        ))
-        elements.append(Spacer(1, 8))
-        elements.append(Paragraph("<b>Mitigations:</b>", risk_body_style))
-        elements.append(Paragraph("N/A", risk_body_style))
-
-        # Permanent Delegate Check
-        delegate_value = token_data.get('permanent_delegate', 'None')
-        has_no_delegate = delegate_value == 'None' or delegate_value is None or delegate_value == ''
-        delegate_header = f"""{'1' if has_no_delegate else '5'} | No Permanent Delegate {'- Pass' if has_no_delegate else '- Fail'}"""
-        elements.append(Paragraph(delegate_header, risk_subheader_style))
-        delegate_description = """Permanent Delegate means that it is set to null and therefore Therefore, no delegate can burn or transfer any amount of tokens."""
-        elements.append(Paragraph(delegate_description, risk_body_style))
-        elements.append(Paragraph("<b>Assessment:</b>", risk_body_style))
-        elements.append(Paragraph(
-            f"""As token metadata indicates, the permanent delegate is: {delegate_value}.""",
-            risk_body_style
-        ))
-        elements.append(Spacer(1, 8))
-        elements.append(Paragraph("<b>Mitigations:</b>", risk_body_style))
-        elements.append(Paragraph("N/A", risk_body_style))
-        
-        # Transaction Fees Check
-        fees_value = token_data.get('transaction_fees', 'None')
-        has_no_fees = (fees_value == 'None' or fees_value is None or fees_value == '' 
-                      or fees_value == '0' or fees_value == 0)
-        fees_header = f"""{'1' if has_no_fees else '5'} | No Transaction Fees {'- Pass' if has_no_fees else '- Fail'}"""
-        elements.append(Paragraph(fees_header, risk_subheader_style))
-        fees_description = """Transaction fees are set to 0 and therefore no transaction fees are possible and send/receive token amounts are the same as expected."""
-        elements.append(Paragraph(fees_description, risk_body_style))
-        elements.append(Paragraph("<b>Assessment:</b>", risk_body_style))
-        elements.append(Paragraph(
-            f"""As token metadata indicates, the transaction fees are: {fees_value}.""",
-            risk_body_style
-        ))
-        elements.append(Spacer(1, 8))
-        elements.append(Paragraph("<b>Mitigations:</b>", risk_body_style))
-        elements.append(Paragraph("N/A", risk_body_style))
-        
-        # Transfer Hook Check
-        hook_value = token_data.get('transfer_hook', 'None')
-        has_no_hook = hook_value == 'None' or hook_value is None or hook_value == ''
-        hook_header = f"""{'1' if has_no_hook else '5'} | No Transfer Hook {'- Pass' if has_no_hook else '- Fail'}"""
-        elements.append(Paragraph(hook_header, risk_subheader_style))
-        
-        transfer_hook_description = """A missing TransferHook means that it is set to null and therefore does not communicate with a custom program whenever this token is transferred."""
-        elements.append(Paragraph(transfer_hook_description, risk_body_style))
-        elements.append(Paragraph("<b>Assessment:</b>", risk_body_style))
-        elements.append(Paragraph(
-            f"""As token metadata indicates, the transfer hook is: {hook_value}.""",
-            risk_body_style
-        ))
-        elements.append(Spacer(1, 8))
-        elements.append(Paragraph("<b>Mitigations:</b>", risk_body_style))
-        elements.append(Paragraph("N/A", risk_body_style))
-        
-        # Confidential Transfers Check
-        confidential_value = token_data.get('confidential_transfers', 'None')
-        has_no_confidential = confidential_value == 'None' or confidential_value is None or confidential_value == ''
-        confidential_header = f"""{'1' if has_no_confidential else '5'} | No Confidential Transfers {'- Pass' if has_no_confidential else '- Fail'}"""
-        elements.append(Paragraph(confidential_header, risk_subheader_style))
-        confidential_description = """The confidential transfer is a non-anonymous, non-private transfer that publicly shares the source, destination, and token type, but uses zero-knowledge proofs to encrypt the amount of the transfer."""
-        elements.append(Paragraph(confidential_description, risk_body_style))
-        elements.append(Paragraph("<b>Assessment:</b>", risk_body_style))
-        elements.append(Paragraph(
-            f"""As token metadata indicates, the confidential transfers are: {confidential_value}.""",
-            risk_body_style
-        ))
-        elements.append(Spacer(1, 8))
-        elements.append(Paragraph("<b>Mitigations:</b>", risk_body_style))
-        elements.append(Paragraph("N/A", risk_body_style))
-    
-    # Build PDF
-    doc.build(elements)
+    if is_token_2022:
+        elements.extend(_build_token2022_risk_sections(report, risk_subheader_style, risk_body_style))
+    
+    return elements
+
+def create_pdf(token_data: Union[Dict, TokenReport], output_dir):
+    """Generate PDF for a single token from an analysis result dict or a TokenReport"""
+    # Styles first: building them applies the reportlab settings
+    styles = _get_styles()
+    report = _as_report(token_data)
+    filepath = os.path.join(output_dir, _memo_filename(report.name, report.symbol))
+    
+    # Render into memory and write the finished document in one call
+    buffer = io.BytesIO()
+    doc = _make_doc(buffer)
+    doc.build(_token_flowables(report, styles))
+    _write_file(filepath, buffer.getbuffer())
     return filepath
 
-# Export the function
-__all__ = ['create_pdf']
+def create_combined_pdf(token_data_list, output_path):
+    """Generate a single PDF holding the memos for all tokens, each starting on a new page.
+
+    Each memo's first page carries the confidentiality header, as in the
+    single-token PDFs.
+    """
+    styles = _get_styles()
+
+    from reportlab.platypus import NextPageTemplate, PageBreak
+
+    elements = []
+    for index, token_data in enumerate(token_data_list):
+        if index:
+            elements.extend([NextPageTemplate('main'), PageBreak()])
+        elements.extend(_token_flowables(_as_report(token_data), styles))
+    
+    buffer = io.BytesIO()
+    doc = _make_doc(buffer)
+    doc.build(elements)
+    _write_file(output_path, buffer.getbuffer())
+    return output_path
+
+def create_pdfs_batch(token_data_list, output_dir, max_workers=None, chunksize=8):
+    """Generate PDFs for many tokens in parallel worker processes.
+
+    Returns the generated file paths in input order. Tokens whose memos would
+    share a filename are written to numbered subdirectories of output_dir so
+    that concurrent workers never overwrite each other. max_workers defaults to
+    the CPU count; tokens are sent to workers chunksize at a time to amortize
+    pickling overhead.
+    """
+    reports = [_as_report(token_data) for token_data in token_data_list]
+    token_dirs = []
+    seen = {}
+    for report in reports:
+        filename = _memo_filename(report.name, report.symbol)
+        seen[filename] = seen.get(filename, 0) + 1
+        if seen[filename] == 1:
+            token_dirs.append(output_dir)
+        else:
+            token_dir = os.path.join(output_dir, str(seen[filename]))
+            os.makedirs(token_dir, exist_ok=True)
+            token_dirs.append(token_dir)
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(create_pdf, reports, token_dirs, chunksize=chunksize))
 
-if __name__ == '__main__':
-    pdf_path = create_pdf(token_data, output_dir)
+# Export the functions
+__all__ = ['create_pdf', 'create_pdfs_batch', 'create_combined_pdf', 'TokenReport']
@@ -1,8 +1,8 @@
 # Copyright 2025 noamasamreen
 
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple, Any, List
-import base64
+from typing import Dict, Optional, Tuple, Any, List, AsyncIterator
 from functools import lru_cache
 import asyncio
 import aiohttp
@@ -10,150 +10,452 @@ import logging
 import json
 from solders.pubkey import Pubkey as PublicKey
 import time
+import weakref
+import struct
 from asyncio import sleep
 
+try:
+    from pybase64 import b64decode
+    _B64_VALIDATE = True  # pybase64's fastest path is its validating SIMD decoder
+except ImportError:  # pybase64 is optional; fall back to the standard library
+    from base64 import b64decode
+    _B64_VALIDATE = False  # the stdlib validates with an extra regex pass
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(value: Any) -> bytes:
+        return json.dumps(value, separators=(',', ':')).encode()
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
 # Constants
 SOLANA_RPC_URL = "https://api.mainnet-beta.solana.com"
+SYSTEM_PROGRAM = "11111111111111111111111111111111"
 TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
 TOKEN_2022_PROGRAM = "TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb"
 METADATA_PROGRAM_ID = "metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s"
+PUMP_UPDATE_AUTHORITY = "TSLvdd1pWpHVjahSpsvCXUbgwsL3JAcvokwaKt1eokM"
 MAX_RETRIES = 4
-BASE_DELAY = 2.0  # 2 second between requests
+RPC_RATE = 10.0  # JSON-RPC HTTP requests per second (mainnet-beta allows 100 per 10 seconds)
+RPC_BURST = 10  # Requests that may go out back to back after an idle period
 RETRY_DELAY = 2.0  # Additional delay when rate limited
 
 # Original constants
-CONCURRENT_LIMIT = 1  # Back to original value
+CONCURRENT_LIMIT = 8  # Tokens whose pump.fun checks may start out running at once
+CONCURRENT_MAX = 32  # Ceiling the pump.fun check limit may grow to while requests go unthrottled
+CONCURRENCY_GROWTH_STREAK = 8  # Unthrottled checks in a row before the limit grows by one
+BATCH_MAX = 50  # Calls per JSON-RPC batch request (mainnet-beta allows up to 100)
+FLUSH_INTERVAL = 0.02  # Seconds a call waits for others to join its batch
+MULTIPLE_ACCOUNTS_MAX = 100  # Accounts per getMultipleAccounts call (the RPC maximum)
 SESSION_TIMEOUT = aiohttp.ClientTimeout(total=30)
+SESSION_HEADERS = {"User-Agent": "spl-token-analysis/1.0"}
+NO_METADATA_TTL = 3600  # Seconds a mint found without a metadata account is not looked up again
+NO_METADATA_MAX = 10000  # Mints remembered as having no metadata account; the oldest are dropped first
+
+# Parsed once; every metadata PDA derivation seeds with these
+_METADATA_PROGRAM_PUBKEY = PublicKey.from_string(METADATA_PROGRAM_ID)
+_METADATA_PROGRAM_BYTES = bytes(_METADATA_PROGRAM_PUBKEY)
+_METADATA_SEED = b"metadata"
+
+_read_u32 = struct.Struct('<I').unpack_from
+_TOKEN_PROGRAMS = frozenset((TOKEN_PROGRAM, TOKEN_2022_PROGRAM))
 
 OWNER_LABELS = {
     TOKEN_PROGRAM: "Token Program",
     TOKEN_2022_PROGRAM: "Token 2022 Program"
 }
-
-async def get_metadata_account(mint_address: str) -> Tuple[PublicKey, int]:
-    """Derive the metadata account address for a mint"""
+# Owner program as shown in results, formatted once per known program
+OWNER_DISPLAY = {program: f"{program} ({label})" for program, label in OWNER_LABELS.items()}
+
+# Mints whose metadata account did not exist, oldest observation first
+_no_metadata_since: "OrderedDict[str, float]" = OrderedDict()
+
+def known_without_metadata(mint_address: str) -> bool:
+    """Whether the mint was recently found to have no metadata account"""
+    since = _no_metadata_since.get(mint_address)
+    if since is None:
+        return False
+    if time.monotonic() - since < NO_METADATA_TTL:
+        return True
+    del _no_metadata_since[mint_address]
+    return False
+
+def record_metadata_lookup(mint_address: str, result: Optional[Dict]) -> None:
+    """Remember mints whose metadata account does not exist; failed lookups are not cached"""
+    if result is None or result.get("value") is not None:
+        return
+    now = time.monotonic()
+    _no_metadata_since[mint_address] = now
+    _no_metadata_since.move_to_end(mint_address)
+    # Entries are kept in observation order, so expired and excess ones sit at the front
+    while _no_metadata_since:
+        oldest = next(iter(_no_metadata_since.values()))
+        if len(_no_metadata_since) <= NO_METADATA_MAX and now - oldest < NO_METADATA_TTL:
+            break
+        _no_metadata_since.popitem(last=False)
+
+@lru_cache(maxsize=10000)
+def get_metadata_account(mint_address: str) -> Tuple[PublicKey, int]:
+    """Derive the metadata account address for a mint, cached per mint"""
     try:
-        metadata_program_id = PublicKey.from_string(METADATA_PROGRAM_ID)
         mint_pubkey = PublicKey.from_string(mint_address)
         
         seeds = [
-            b"metadata",
-            bytes(metadata_program_id),
+            _METADATA_SEED,
+            _METADATA_PROGRAM_BYTES,
             bytes(mint_pubkey)
         ]
         
         return PublicKey.find_program_address(
             seeds,
-            metadata_program_id
+            _METADATA_PROGRAM_PUBKEY
         )
     except Exception as e:
         logging.error(f"Error deriving metadata account: {e}")
         return None, None
 
-async def get_metadata(session: aiohttp.ClientSession, mint_address: str) -> Optional[Dict]:
-    """Fetch metadata for a token with more conservative retry logic"""
+def metadata_string_bounds(data: bytes) -> Tuple[int, int, int, int]:
+    """Return (name_start, name_length, symbol_start, symbol_length) within raw metadata account data"""
+    # Discriminator (1 byte), update authority (32 bytes) and mint (32 bytes) precede the name
+    name_start = 1 + 32 + 32 + 4
+    (name_length,) = _read_u32(data, name_start - 4)
+    symbol_start = name_start + name_length + 4
+    (symbol_length,) = _read_u32(data, symbol_start - 4)
+    return name_start, name_length, symbol_start, symbol_length
+
+def parse_metadata_account(account_info: Optional[Dict]) -> Optional[Dict]:
+    """Parse name, symbol and update authority from a metadata account returned by getAccountInfo"""
+    if not account_info:
+        logging.warning("No metadata data returned from RPC")
+        return None
+
+    try:
+        # Parse the metadata account data
+        account_data = account_info["data"][0]
+        decoded_data = b64decode(account_data, validate=_B64_VALIDATE)
+        
+        if len(decoded_data) < 8:  # Ensure we have enough data
+            logging.warning("Metadata data too short")
+            return None
+            
+        # Read update authority (32 bytes after the discriminator)
+        update_authority = str(PublicKey(decoded_data[1:33]))
+        
+        # Walk the length-prefixed strings once, then decode each slice up to its NUL padding
+        name_start, name_length, symbol_start, symbol_length = metadata_string_bounds(decoded_data)
+        if name_length > 0:
+            name = decoded_data[name_start:name_start + name_length].split(b'\x00', 1)[0].decode('utf-8')
+        else:
+            name = "N/A"
+        if symbol_length > 0:
+            symbol = decoded_data[symbol_start:symbol_start + symbol_length].split(b'\x00', 1)[0].decode('utf-8')
+        else:
+            symbol = "N/A"
+        
+        logging.info(f"Successfully parsed metadata - Name: {name}, Symbol: {symbol}")
+        return {
+            "name": name,
+            "symbol": symbol,
+            "update_authority": update_authority
+        }
+    except UnicodeDecodeError as e:
+        logging.error(f"Error decoding metadata strings: {e}")
+        return None
+    except Exception as e:
+        logging.error(f"Error parsing metadata: {e}")
+        return None
+
+def create_session() -> aiohttp.ClientSession:
+    """Create an HTTP session whose pooled keep-alive connections are reused across RPC calls"""
+    connector = aiohttp.TCPConnector(
+        limit=64,
+        limit_per_host=32,
+        ttl_dns_cache=600,  # Resolve the RPC host once per run
+        keepalive_timeout=120,  # Outlive rate-limit waits so the TLS session survives between requests
+        enable_cleanup_closed=True,  # Reclaim TLS transports the server drops without a clean shutdown
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=SESSION_TIMEOUT, headers=SESSION_HEADERS)
+
+class TokenBucket:
+    """Async token-bucket rate limiter: rate acquisitions per second, bursts up to capacity.
+
+    Callers that find the bucket empty reserve a future token and sleep until
+    it is due, so waiting callers are released in order at the refill rate.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1):
+        self.base_rate = self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._penalty_until = 0.0
+        self.penalties = 0  # Times the server has reported rate limiting
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._penalty_until and now >= self._penalty_until:
+            self.rate = self.base_rate
+            self._penalty_until = 0.0
+
+    async def acquire(self) -> None:
+        # No await before the reservation, so concurrent callers can't race on the count
+        self._refill(time.monotonic())
+        self._tokens -= 1
+        if self._tokens < 0:
+            await sleep(-self._tokens / self.rate)
+
+    def penalize(self, duration: float) -> None:
+        """Halve the refill rate for duration seconds after the server reports rate limiting"""
+        now = time.monotonic()
+        self._refill(now)
+        self.penalties += 1
+        self.rate = max(self.rate / 2, self.base_rate / 16)
+        self._penalty_until = now + duration
+
+class AdmissionGate:
+    """Concurrency limit guarded by a Condition so it can be resized while tasks wait.
+
+    The limit halves once for each rate limit penalty the limiter records and grows
+    by one after a streak of CONCURRENCY_GROWTH_STREAK unthrottled tasks, up to
+    CONCURRENT_MAX.
+    """
+
+    def __init__(self, limiter: TokenBucket, limit: int = CONCURRENT_LIMIT, max_limit: int = CONCURRENT_MAX):
+        self.limiter = limiter
+        self.limit = limit
+        self.max_limit = max_limit
+        self.active = 0
+        self._streak = 0
+        # Set when the first task enters, so penalties from earlier requests (such as
+        # the account prefetch) never shrink the limit
+        self._seen_penalties: Optional[int] = None
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self) -> "AdmissionGate":
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.active < self.limit)
+            if self._seen_penalties is None:
+                self._seen_penalties = self.limiter.penalties
+            self.active += 1
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        async with self._condition:
+            self.active -= 1
+            self._condition.notify(1)
+
+    async def record(self, penalties_at_start: int) -> None:
+        """Resize the limit after a task, given the limiter's penalty count when it started"""
+        async with self._condition:
+            penalties = self.limiter.penalties
+            if penalties != self._seen_penalties:
+                # Only the first task to finish after a new penalty shrinks the limit, so
+                # one 429 seen by many concurrent tasks halves it once
+                self._seen_penalties = penalties
+                self._streak = 0
+                self.limit = max(1, self.limit // 2)
+                logging.warning(f"Rate limited; admitting {self.limit} pump.fun checks at once")
+            elif penalties != penalties_at_start:
+                # Throttled by a penalty another task already accounted for
+                self._streak = 0
+            else:
+                self._streak += 1
+                if self._streak >= CONCURRENCY_GROWTH_STREAK and self.limit < self.max_limit:
+                    self._streak = 0
+                    self.limit += 1
+                    self._condition.notify_all()
+
+async def rpc_batch(session: aiohttp.ClientSession, calls: List[Tuple[str, list]], limiter: Optional[TokenBucket] = None) -> List[Optional[Any]]:
+    """Send several JSON-RPC calls in one POST and return their results in call order.
+
+    Calls that fail or return an error yield None.
+    """
+    # Serialized once up front; retries resend the same bytes
+    payload = _json_dumps([
+        {"jsonrpc": "2.0", "id": index, "method": method, "params": params}
+        for index, (method, params) in enumerate(calls)
+    ])
+    results: List[Optional[Any]] = [None] * len(calls)
     for retry in range(MAX_RETRIES):
         try:
-            # Add base delay before every request
-            await sleep(BASE_DELAY)
-            
-            metadata_address, _ = await get_metadata_account(mint_address)
-            if not metadata_address:
-                logging.warning(f"Could not derive metadata address for {mint_address}")
-                return None
-
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "getAccountInfo",
-                "params": [
-                    str(metadata_address),
-                    {"encoding": "base64"}
-                ]
-            }
-            
-            async with session.post(SOLANA_RPC_URL, json=payload) as response:
+            if limiter is not None:
+                await limiter.acquire()
+            async with session.post(SOLANA_RPC_URL, data=payload, headers=_JSON_HEADERS) as response:
                 if response.status == 429:  # Rate limit hit
                     if retry < MAX_RETRIES - 1:
                         wait_time = RETRY_DELAY * (2 ** retry)  # Exponential backoff
-                        logging.warning(f"Rate limit hit in metadata fetch, waiting {wait_time} seconds...")
+                        logging.warning(f"Rate limit hit in batch request, waiting {wait_time} seconds...")
+                        if limiter is not None:
+                            limiter.penalize(wait_time)
                         await sleep(wait_time)
                         continue
-                    return None
+                    return results
                     
                 if response.status != 200:
                     logging.warning(f"Non-200 status code: {response.status}")
-                    return None
-                    
-                data = await response.json()
-                if "result" not in data or not data["result"] or not data["result"]["value"]:
-                    logging.warning("No metadata data returned from RPC")
-                    return None
-
-                # Parse the metadata account data
-                account_data = data["result"]["value"]["data"][0]
-                decoded_data = base64.b64decode(account_data)
-                
-                if len(decoded_data) < 8:  # Ensure we have enough data
-                    logging.warning("Metadata data too short")
-                    return None
-                    
-                try:
-                    # Skip the first byte (discriminator)
-                    offset = 1
-                    
-                    # Read update authority (32 bytes)
-                    update_authority = str(PublicKey(decoded_data[offset:offset + 32]))
-                    offset += 32
-                    
-                    # Skip mint address (32 bytes)
-                    offset += 32
+                    return results
                     
-                    # Read name length and name
-                    name_length = int.from_bytes(decoded_data[offset:offset + 4], byteorder='little')
-                    offset += 4
-                    if name_length > 0:
-                        name = decoded_data[offset:offset + name_length].decode('utf-8').rstrip('\x00')
-                    else:
-                        name = "N/A"
-                    offset += name_length
-                    
-                    # Read symbol length and symbol
-                    symbol_length = int.from_bytes(decoded_data[offset:offset + 4], byteorder='little')
-                    offset += 4
-                    if symbol_length > 0:
-                        symbol = decoded_data[offset:offset + symbol_length].decode('utf-8').rstrip('\x00')
-                    else:
-                        symbol = "N/A"
-                    
-                    logging.info(f"Successfully parsed metadata - Name: {name}, Symbol: {symbol}")
-                    return {
-                        "name": name,
-                        "symbol": symbol,
-                        "update_authority": update_authority
-                    }
-                except UnicodeDecodeError as e:
-                    logging.error(f"Error decoding metadata strings: {e}")
-                    return None
-                except Exception as e:
-                    logging.error(f"Error parsing metadata: {e}")
-                    return None
+                data = _json_loads(await response.read())
+                if not isinstance(data, list):
+                    logging.warning(f"Unexpected batch response: {data}")
+                    return results
+
+                # Responses can arrive in any order; match them to calls by id
+                for item in data:
+                    index = item.get("id")
+                    if isinstance(index, int) and 0 <= index < len(calls) and "result" in item:
+                        results[index] = item["result"]
+                return results
                 
         except Exception as e:
             if retry < MAX_RETRIES - 1:
                 await sleep(RETRY_DELAY * (retry + 1))
                 continue
-            logging.error(f"Error fetching metadata: {str(e)}")
-            return None
-
-@dataclass
+            logging.error(f"Error sending batch request: {str(e)}")
+    return results
+
+class RpcBatcher:
+    """Coalesces JSON-RPC calls from concurrent coroutines into batch requests.
+
+    A batch is sent once BATCH_MAX calls are queued or FLUSH_INTERVAL seconds
+    after its first call, whichever comes first.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, max_batch: int = BATCH_MAX, flush_interval: float = FLUSH_INTERVAL):
+        # Held weakly so the batcher registry does not keep closed sessions alive
+        self._session = weakref.ref(session)
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.limiter = TokenBucket(RPC_RATE, RPC_BURST)
+        self._pending: List[Tuple[str, list, asyncio.Future]] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._in_flight = set()
+
+    async def call(self, method: str, params: list) -> Optional[Any]:
+        """Queue a call and return its result, or None if it failed"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((method, params, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(self.flush_interval, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.ensure_future(self._send(pending))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _send(self, pending: List[Tuple[str, list, asyncio.Future]]) -> None:
+        try:
+            session = self._session()
+            if session is None:
+                raise RuntimeError("session was closed before the batch was sent")
+            results = await rpc_batch(session, [(method, params) for method, params, _ in pending], self.limiter)
+        except Exception as e:
+            logging.error(f"Error sending batch request: {str(e)}")
+            results = [None] * len(pending)
+        for (_, _, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+_batchers: "weakref.WeakKeyDictionary[aiohttp.ClientSession, RpcBatcher]" = weakref.WeakKeyDictionary()
+
+def get_batcher(session: aiohttp.ClientSession) -> RpcBatcher:
+    """Return the request batcher shared by all calls made through session"""
+    batcher = _batchers.get(session)
+    if batcher is None:
+        batcher = _batchers[session] = RpcBatcher(session)
+    return batcher
+
+def is_valid_address(address: str) -> bool:
+    """Whether the address parses as a base58 public key"""
+    try:
+        PublicKey.from_string(address)
+    except ValueError:
+        return False
+    return True
+
+async def batch_get_account_info(session: aiohttp.ClientSession, addresses: List[str], encoding: str) -> List[Optional[Dict]]:
+    """Fetch many accounts with getMultipleAccounts, returning getAccountInfo-shaped results in address order.
+
+    A missing account yields {"value": None}. The accounts of a failed call are retried one
+    by one with getAccountInfo, so a single bad account only fails its own lookup (None).
+    """
+    batcher = get_batcher(session)
+    chunks = [addresses[start:start + MULTIPLE_ACCOUNTS_MAX] for start in range(0, len(addresses), MULTIPLE_ACCOUNTS_MAX)]
+    chunk_results = await asyncio.gather(*(
+        batcher.call("getMultipleAccounts", [chunk, {"encoding": encoding}]) for chunk in chunks
+    ))
+    results: List[Optional[Dict]] = []
+    for chunk, chunk_result in zip(chunks, chunk_results):
+        if chunk_result is None:
+            logging.warning(f"getMultipleAccounts failed for {len(chunk)} accounts, retrying them individually")
+            results.extend(await asyncio.gather(*(
+                batcher.call("getAccountInfo", [address, {"encoding": encoding}]) for address in chunk
+            )))
+        else:
+            results.extend({"value": value} for value in chunk_result["value"])
+    return results
+
+async def fetch_token_accounts(session: aiohttp.ClientSession, token_addresses: List[str]) -> List[Tuple[Optional[Dict], Optional[Dict]]]:
+    """Fetch the mint account and parsed metadata of each token through the session's request batcher"""
+    account_results = await batch_get_account_info(session, token_addresses, "jsonParsed")
+    account_infos = [result["value"] if result else None for result in account_results]
+
+    # System and other non-token accounts have no token metadata to parse or pump.fun
+    # authority to verify, so metadata accounts are only requested for token program
+    # mints and for addresses whose account could not be read, unless the mint was
+    # recently found to have none
+    metadata_addresses = []
+    metadata_indexes = []
+    for address, account_info in zip(token_addresses, account_infos):
+        if (account_info and account_info.get("owner") not in _TOKEN_PROGRAMS) or known_without_metadata(address):
+            metadata_indexes.append(None)
+            continue
+        metadata_address, _ = get_metadata_account(address)
+        if metadata_address:
+            metadata_indexes.append(len(metadata_addresses))
+            metadata_addresses.append(str(metadata_address))
+        else:
+            logging.warning(f"Could not derive metadata address for {address}")
+            metadata_indexes.append(None)
+
+    metadata_results = await batch_get_account_info(session, metadata_addresses, "base64") if metadata_addresses else []
+    fetched = []
+    for address, account_info, metadata_index in zip(token_addresses, account_infos, metadata_indexes):
+        metadata = None
+        if metadata_index is not None:
+            metadata_result = metadata_results[metadata_index]
+            record_metadata_lookup(address, metadata_result)
+            metadata = parse_metadata_account(metadata_result["value"] if metadata_result else None)
+        fetched.append((account_info, metadata))
+    return fetched
+
+@dataclass(slots=True)
 class Token2022Extensions:
     permanent_delegate: Optional[str] = None
     transfer_fee: Optional[int] = None
     transfer_hook_authority: Optional[str] = None
     confidential_transfers_authority: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class TokenDetails:
     name: str
     symbol: str
@@ -170,6 +472,8 @@ class TokenDetails:
     token_graduated_to_raydium: bool = False
 
     def to_dict(self) -> Dict:
+        # Whether this is a pump.fun mint decides two parts of the output; compare once
+        is_pump_mint = self.update_authority == PUMP_UPDATE_AUTHORITY
         result = {
             'name': self.name,
             'symbol': self.symbol,
@@ -177,19 +481,18 @@ class TokenDetails:
             'owner_program': self.owner_program,
             'freeze_authority': self.freeze_authority,
             'update_authority': (f"{self.update_authority} (Pump.Fun Mint Authority)" 
-                               if self.update_authority == "TSLvdd1pWpHVjahSpsvCXUbgwsL3JAcvokwaKt1eokM" 
+                               if is_pump_mint 
                                else self.update_authority)
         }
         
-        if self.extensions:
-            result.update({
-                'permanent_delegate': self.extensions.permanent_delegate,
-                'transaction_fees': self.extensions.transfer_fee,
-                'transfer_hook': self.extensions.transfer_hook_authority,
-                'confidential_transfers': self.extensions.confidential_transfers_authority,
-            })
+        extensions = self.extensions
+        if extensions:
+            result['permanent_delegate'] = extensions.permanent_delegate
+            result['transaction_fees'] = extensions.transfer_fee
+            result['transfer_hook'] = extensions.transfer_hook_authority
+            result['confidential_transfers'] = extensions.confidential_transfers_authority
         
-        if self.update_authority == "TSLvdd1pWpHVjahSpsvCXUbgwsL3JAcvokwaKt1eokM":
+        if is_pump_mint:
             result['is_genuine_pump_fun_token'] = self.is_genuine_pump_fun_token
             result['token_graduated_to_raydium'] = self.token_graduated_to_raydium
             if self.is_genuine_pump_fun_token and self.interacted_with:
@@ -200,16 +503,44 @@ class TokenDetails:
         result['security_review'] = self.security_review
         return result
 
-@lru_cache(maxsize=100)
-def get_owner_program_label(owner_address: str) -> str:
-    """Cached helper function to get the label for owner program"""
-    return OWNER_LABELS.get(owner_address, "Unknown Owner")
-
-async def verify_pump_token(session: aiohttp.ClientSession, token_address: str, metadata: Optional[dict] = None) -> Tuple[bool, Optional[str], Optional[str], Optional[str]]:
-    """Verify if token is a genuine pump.fun token using new criteria"""
+async def fetch_recent_transactions(session: aiohttp.ClientSession, token_addresses: List[str]) -> Dict[str, Optional[List[Tuple[str, Optional[Dict]]]]]:
+    """Fetch the recent (signature, transaction) pairs of each token in two batched round trips"""
+    batcher = get_batcher(session)
+    # Signatures for every token first, then every transaction they name
+    signature_lists = await asyncio.gather(*(
+        batcher.call("getSignaturesForAddress", [address, {"limit": 3, "commitment": "confirmed"}])
+        for address in token_addresses
+    ))
+    # A transaction touching several tokens is fetched once and shared between them
+    signatures = list(dict.fromkeys(
+        sig_info['signature'] for sig_infos in signature_lists if sig_infos for sig_info in sig_infos
+    ))
+    transactions = await asyncio.gather(*(
+        batcher.call("getTransaction", [
+            signature,
+            {
+                "encoding": "jsonParsed",
+                "maxSupportedTransactionVersion": 0,
+                "commitment": "confirmed"
+            }
+        ])
+        for signature in signatures
+    ))
+    by_signature = dict(zip(signatures, transactions))
+    return {
+        address: None if sig_infos is None else [(sig_info['signature'], by_signature[sig_info['signature']]) for sig_info in sig_infos]
+        for address, sig_infos in zip(token_addresses, signature_lists)
+    }
+
+async def verify_pump_token(session: aiohttp.ClientSession, token_address: str, metadata: Optional[dict] = None,
+                            recent_transactions: Optional[List[Tuple[str, Optional[Dict]]]] = None) -> Tuple[bool, Optional[str], Optional[str], Optional[str]]:
+    """Verify if token is a genuine pump.fun token using new criteria
+
+    recent_transactions may carry the token's entry from fetch_recent_transactions;
+    otherwise they are fetched here.
+    """
     PUMP_PROGRAM = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
     RAYDIUM_AMM_PROGRAM = "EhhTKJ6M13fa4jc281HpdyiNpAHj8uvxymgZqGuDs9Jj"
-    PUMP_UPDATE_AUTHORITY = "TSLvdd1pWpHVjahSpsvCXUbgwsL3JAcvokwaKt1eokM"
     
     # Step 1: Check update authority
     if not metadata or metadata.get("update_authority") != PUMP_UPDATE_AUTHORITY:
@@ -230,7 +561,7 @@ async def verify_pump_token(session: aiohttp.ClientSession, token_address: str,
                 logging.error(f"Raydium API returned status {response.status}")
                 return False, None, None, None
                 
-            raydium_data = await response.json()
+            raydium_data = _json_loads(await response.read())
             #logging.info(f"Raydium Token Info Response: {raydium_data}")
             
             # Check if response has data field and contains valid token info
@@ -252,157 +583,116 @@ async def verify_pump_token(session: aiohttp.ClientSession, token_address: str,
 
     # Step 2: Check recent transactions for Pump.fun interaction
     try:
-        params = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "getSignaturesForAddress",
-            "params": [
-                token_address,
-                {
-                    "limit": 3,
-                    "commitment": "confirmed"
-                }
-            ]
-        }
-        
-    
-        async with session.post(SOLANA_RPC_URL, json=params) as response:
-            data = await response.json()
-            if "result" not in data:
-                logging.warning(f"No transaction data found for token {token_address}")
-                # Continue to Step 3
-            else:
-                signatures = data["result"]
-                logging.info(f"Pump.fun Token Checks: Found recent transactions")
+        batcher = get_batcher(session)
+        if recent_transactions is None:
+            recent_transactions = (await fetch_recent_transactions(session, [token_address]))[token_address]
+        if recent_transactions is None:
+            logging.warning(f"No transaction data found for token {token_address}")
+            # Continue to Step 3
+        else:
+            logging.info(f"Pump.fun Token Checks: Found recent transactions")
+            
+            # Check each transaction for Pump.fun interaction
+            for signature, tx in recent_transactions:
+                #logging.info(f"Checking transaction: {signature}")
+                if not tx:
+                    continue
+                    
+                # Add detailed logging for debugging
+                # A new list: the transaction dicts are shared by every token that touched them
+                loaded_addresses = tx.get("meta", {}).get("loadedAddresses", {})
+                accounts = [
+                    *loaded_addresses.get("writable", []),
+                    *loaded_addresses.get("readonly", []),
+                    *tx.get("transaction", {}).get("message", {}).get("accountKeys", []),
+                ]
                 
-                # Check each transaction for Pump.fun interaction
-                for sig_info in signatures:
-                    #logging.info(f"Checking transaction: {sig_info['signature']}")
-                    tx_params = {
-                        "jsonrpc": "2.0",
-                        "id": 1,
-                        "method": "getTransaction",
-                        "params": [
-                            sig_info['signature'],
+                #logging.info(f"\nDetailed Transaction Info for {signature}:")
+                #logging.info("----------------------------------------")
+                
+                # Log all account details in the transaction and check for verification
+                #logging.info("Account Details:")
+                for idx, acc in enumerate(accounts):
+                    try:
+                        # Get account info for each address
+                        acc_pubkey = acc if isinstance(acc, str) else acc.get('pubkey')
+                        if not acc_pubkey:
+                            continue
+
+                        acc_result = await batcher.call("getAccountInfo", [
+                            acc_pubkey,
                             {
                                 "encoding": "jsonParsed",
-                                "maxSupportedTransactionVersion": 0,
                                 "commitment": "confirmed"
                             }
-                        ]
-                    }
-                    async with session.post(SOLANA_RPC_URL, json=tx_params) as tx_response:
-                        tx_data = await tx_response.json()
-                        if "result" not in tx_data or not tx_data["result"]:
+                        ])
+                        if acc_result is None:
+                            #logging.info(f"No account info found for {acc_pubkey}")
                             continue
                             
-                        # Add detailed logging for debugging
-                        accounts = tx_data["result"].get("meta", {}).get("loadedAddresses", {}).get("writable", [])
-                        accounts.extend(tx_data["result"].get("meta", {}).get("loadedAddresses", {}).get("readonly", []))
-                        accounts.extend(tx_data["result"].get("transaction", {}).get("message", {}).get("accountKeys", []))
-                        
-                        #logging.info(f"\nDetailed Transaction Info for {sig_info['signature']}:")
-                        #logging.info("----------------------------------------")
-                        
-                        # Log all account details in the transaction and check for verification
-                        #logging.info("Account Details:")
-                        for idx, acc in enumerate(accounts):
-                            try:
-                                # Get account info for each address
-                                acc_pubkey = acc if isinstance(acc, str) else acc.get('pubkey')
-                                if not acc_pubkey:
-                                    continue
-
-                                acc_info_params = {
-                                    "jsonrpc": "2.0",
-                                    "id": 1,
-                                    "method": "getAccountInfo",
-                                    "params": [
-                                        acc_pubkey,
-                                        {
-                                            "encoding": "jsonParsed",
-                                            "commitment": "confirmed"
-                                        }
-                                    ]
-                                }
-                                await asyncio.sleep(1)
-                                async with session.post(SOLANA_RPC_URL, json=acc_info_params) as acc_response:
-                                    acc_data = await acc_response.json()
-                                    if "result" not in acc_data or acc_data["result"] is None:
-                                        #logging.info(f"No account info found for {acc_pubkey}")
-                                        continue
-                                        
-                                    acc_info = acc_data["result"].get("value")
-                                    if not acc_info:
-                                        #logging.info(f"No value in account info for {acc_pubkey}")
-                                        continue
-                                        
-                                    acc_owner = acc_info.get('owner')
-                                    #acc_program = acc_info.get('data', {}).get('program') if isinstance(acc_info.get('data'), dict) else None
-                                    
-                                    #logging.info(f"Account {idx}:")
-                                    #logging.info(f"  Pubkey: {acc_pubkey}")
-                                    #logging.info(f"  Owner: {acc_owner}")
-                                    #logging.info(f"  Program: {acc_program}")
-                                    #logging.info(f"  Data Program: {acc_info.get('data', {}).get('program') if isinstance(acc_info.get('data'), dict) else 'N/A'}")
-                                    #logging.info(f"  Signer: {acc.get('signer', False) if not isinstance(acc, str) else False}")
-                                    #logging.info(f"  Writable: {acc.get('writable', False) if not isinstance(acc, str) else False}")
-                                    #logging.info(f"  Raw Data: {acc_info}")  # Add this for debugging
-
-                                    # Check for verification during the initial fetch
-                                    if acc_owner == PUMP_PROGRAM:
-                                        logging.info(f"Found account {acc_pubkey} owned by Pump.fun program in tx {sig_info['signature']}")
-                                        return True, "pump.fun", acc_pubkey, sig_info['signature']
-
-                            except Exception as e:
-                                logging.error(f"Error fetching account info for account {idx}: {str(e)}")
-                                continue
-                        
-                        # Log instruction details
-                        instructions = tx_data["result"].get("transaction", {}).get("message", {}).get("instructions", [])
-                        #logging.info("\nInstruction Details:")
-                        #for idx, inst in enumerate(instructions):
-                        #    logging.info(f"Instruction {idx}:")
-                        #    logging.info(f"  Program ID: {inst.get('programId', 'N/A')}")
-                        #    logging.info(f"  Accounts: {inst.get('accounts', [])}")
-                        #    logging.info(f"  Data: {inst.get('data', 'N/A')}")
-                        
-                        #logging.info("----------------------------------------\n")
+                        acc_info = acc_result.get("value")
+                        if not acc_info:
+                            #logging.info(f"No value in account info for {acc_pubkey}")
+                            continue
+                            
+                        acc_owner = acc_info.get('owner')
+                        #acc_program = acc_info.get('data', {}).get('program') if isinstance(acc_info.get('data'), dict) else None
                         
-                        # Now check each account's owner
-                        for acc in accounts:
-                            try:
-                                acc_pubkey = acc if isinstance(acc, str) else acc.get('pubkey')
-                                if not acc_pubkey:
-                                    continue
-                                    
-                                acc_info_params = {
-                                    "jsonrpc": "2.0",
-                                    "id": 1,
-                                    "method": "getAccountInfo",
-                                    "params": [acc_pubkey, {"encoding": "jsonParsed"}]
-                                }
-                                
-                                async with session.post(SOLANA_RPC_URL, json=acc_info_params) as acc_response:
-                                    acc_data = await acc_response.json()
-                                    if not acc_data.get("result", {}).get("value"):
-                                        continue
-                                        
-                                    acc_owner = acc_data.get("result", {}).get("value", {}).get("owner")
-                                    if not acc_owner:
-                                        continue
-                                    
-                                    if acc_owner == PUMP_PROGRAM:
-                                        logging.info(f"Found account {acc_pubkey} owned by Pump.fun program in tx {sig_info['signature']}")
-                                        return True, "pump.fun", acc_pubkey, sig_info['signature']
-                                    elif acc_owner == RAYDIUM_AMM_PROGRAM or acc_pubkey == RAYDIUM_AMM_PROGRAM:
-                                        logging.info(f"Found Raydium AMM interaction in tx {sig_info['signature']}")
-                                        return True, "raydium", acc_pubkey, sig_info['signature']
-                            except Exception as e:
-                                logging.error(f"Error checking account {acc_pubkey}: {str(e)}")
-                                continue
+                        #logging.info(f"Account {idx}:")
+                        #logging.info(f"  Pubkey: {acc_pubkey}")
+                        #logging.info(f"  Owner: {acc_owner}")
+                        #logging.info(f"  Program: {acc_program}")
+                        #logging.info(f"  Data Program: {acc_info.get('data', {}).get('program') if isinstance(acc_info.get('data'), dict) else 'N/A'}")
+                        #logging.info(f"  Signer: {acc.get('signer', False) if not isinstance(acc, str) else False}")
+                        #logging.info(f"  Writable: {acc.get('writable', False) if not isinstance(acc, str) else False}")
+                        #logging.info(f"  Raw Data: {acc_info}")  # Add this for debugging
+
+                        # Check for verification during the initial fetch
+                        if acc_owner == PUMP_PROGRAM:
+                            logging.info(f"Found account {acc_pubkey} owned by Pump.fun program in tx {signature}")
+                            return True, "pump.fun", acc_pubkey, signature
+
+                    except Exception as e:
+                        logging.error(f"Error fetching account info for account {idx}: {str(e)}")
+                        continue
+                
+                # Log instruction details
+                instructions = tx.get("transaction", {}).get("message", {}).get("instructions", [])
+                #logging.info("\nInstruction Details:")
+                #for idx, inst in enumerate(instructions):
+                #    logging.info(f"Instruction {idx}:")
+                #    logging.info(f"  Program ID: {inst.get('programId', 'N/A')}")
+                #    logging.info(f"  Accounts: {inst.get('accounts', [])}")
+                #    logging.info(f"  Data: {inst.get('data', 'N/A')}")
                 
-                logging.info("Pump.fun Token Checks: No accounts owned by Pump.fun program found in recent transactions")
+                #logging.info("----------------------------------------\n")
+                
+                # Now check each account's owner
+                for acc in accounts:
+                    try:
+                        acc_pubkey = acc if isinstance(acc, str) else acc.get('pubkey')
+                        if not acc_pubkey:
+                            continue
+                            
+                        acc_result = await batcher.call("getAccountInfo", [acc_pubkey, {"encoding": "jsonParsed"}])
+                        if not acc_result or not acc_result.get("value"):
+                            continue
+                            
+                        acc_owner = acc_result["value"].get("owner")
+                        if not acc_owner:
+                            continue
+                        
+                        if acc_owner == PUMP_PROGRAM:
+                            logging.info(f"Found account {acc_pubkey} owned by Pump.fun program in tx {signature}")
+                            return True, "pump.fun", acc_pubkey, signature
+                        elif acc_owner == RAYDIUM_AMM_PROGRAM or acc_pubkey == RAYDIUM_AMM_PROGRAM:
+                            logging.info(f"Found Raydium AMM interaction in tx {signature}")
+                            return True, "raydium", acc_pubkey, signature
+                    except Exception as e:
+                        logging.error(f"Error checking account {acc_pubkey}: {str(e)}")
+                        continue
+            
+            logging.info("Pump.fun Token Checks: No accounts owned by Pump.fun program found in recent transactions")
     
     except Exception as e:
         logging.error(f"Error checking transactions: {str(e)}")           
@@ -410,102 +700,99 @@ async def verify_pump_token(session: aiohttp.ClientSession, token_address: str,
     
     return False, None, None, None
 
+def build_token_details(token_address: str, account_info: Optional[Dict], metadata: Optional[Dict]) -> Tuple[TokenDetails, str]:
+    """Build token details from a fetched mint account and its metadata"""
+    if account_info:
+        # Process token data to get security review
+        logging.info("Processing token account data for security review")
+        token_details, owner_program = process_token_data(account_info, token_address)
+        
+        # Update token details with metadata if available
+        if metadata:
+            token_details.name = metadata.get("name", token_details.name)
+            token_details.symbol = metadata.get("symbol", token_details.symbol)
+            token_details.update_authority = metadata.get("update_authority")
+            logging.info(f"Updated token details with metadata - Name: {token_details.name}, Symbol: {token_details.symbol}")
+    else:
+        logging.warning("No account data found for security review")
+        token_details = TokenDetails(
+            name=metadata.get("name", "N/A") if metadata else "N/A",
+            symbol=metadata.get("symbol", "N/A") if metadata else "N/A",
+            address=token_address,
+            owner_program=TOKEN_PROGRAM,
+            freeze_authority=None,
+            update_authority=metadata.get("update_authority") if metadata else None,
+            security_review="FAILED"
+        )
+        owner_program = TOKEN_PROGRAM
+    return token_details, owner_program
+
+def is_pump_authority(metadata: Optional[Dict]) -> bool:
+    """Whether the metadata update authority is the pump.fun mint authority"""
+    return bool(metadata) and metadata.get("update_authority") == PUMP_UPDATE_AUTHORITY
+
+async def check_pump_token(session: aiohttp.ClientSession, token_details: TokenDetails, metadata: Optional[Dict],
+                           recent_transactions: Optional[List[Tuple[str, Optional[Dict]]]] = None) -> None:
+    """Record the pump.fun verification result on a potential pump token"""
+    logging.info(f"Pump.fun Token Checks: Potential pump token detected")
+    is_genuine_pump_fun_token, interacted_with, interacting_account, interaction_signature = await verify_pump_token(
+        session, token_details.address, metadata, recent_transactions)
+    
+    token_details.is_genuine_pump_fun_token = is_genuine_pump_fun_token
+    token_details.interacted_with = interacted_with
+    token_details.interacting_account = interacting_account
+    token_details.interaction_signature = interaction_signature
+    token_details.token_graduated_to_raydium = (is_genuine_pump_fun_token and interacted_with == "raydium")
+
+def error_token_details(token_address: str) -> TokenDetails:
+    """Placeholder details for a token that could not be analyzed"""
+    return TokenDetails(
+        name="ERROR",
+        symbol="ERROR",
+        address=token_address,
+        owner_program="Error",
+        freeze_authority=None,
+        security_review="FAILED"
+    )
+
 async def get_token_details_async(token_address: str, session: aiohttp.ClientSession) -> Tuple[TokenDetails, Optional[str]]:
+    if not is_valid_address(token_address):
+        logging.error(f"Invalid token address: {token_address}")
+        return error_token_details(token_address), None
     try:
-        # First get metadata to check update authority
-        metadata = await get_metadata(session, token_address)
-        #logging.info(f"Metadata response: {metadata}")
-        
-        # Get token account info to check program features
-        acc_info_params = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "getAccountInfo",
-            "params": [
-                token_address,
-                {"encoding": "jsonParsed"}
-            ]
-        }
-        
-        async with session.post(SOLANA_RPC_URL, json=acc_info_params) as response:
-            acc_data = await response.json()
-            if "result" in acc_data and acc_data["result"] and acc_data["result"]["value"]:
-                # Process token data to get security review
-                logging.info("Processing token account data for security review")
-                token_details, owner_program = process_token_data(acc_data["result"]["value"], token_address)
-                
-                # Update token details with metadata if available
-                if metadata:
-                    token_details.name = metadata.get("name", token_details.name)
-                    token_details.symbol = metadata.get("symbol", token_details.symbol)
-                    token_details.update_authority = metadata.get("update_authority")
-                    logging.info(f"Updated token details with metadata - Name: {token_details.name}, Symbol: {token_details.symbol}")
-            else:
-                logging.warning("No account data found for security review")
-                token_details = TokenDetails(
-                    name=metadata.get("name", "N/A") if metadata else "N/A",
-                    symbol=metadata.get("symbol", "N/A") if metadata else "N/A",
-                    address=token_address,
-                    owner_program=TOKEN_PROGRAM,
-                    freeze_authority=None,
-                    update_authority=metadata.get("update_authority") if metadata else None,
-                    security_review="FAILED"
-                )
-                owner_program = TOKEN_PROGRAM
+        # Mint account and metadata come back from one batch request
+        [(account_info, metadata)] = await fetch_token_accounts(session, [token_address])
+        token_details, owner_program = build_token_details(token_address, account_info, metadata)
             
         # Check if it's a potential pump token
-        is_pump_authority = metadata and metadata.get("update_authority") == "TSLvdd1pWpHVjahSpsvCXUbgwsL3JAcvokwaKt1eokM"
-        
-        if is_pump_authority:
-            logging.info(f"Pump.fun Token Checks: Potential pump token detected")
-            is_genuine_pump_fun_token, interacted_with, interacting_account, interaction_signature = await verify_pump_token(session, token_address, metadata)
-            
-            token_details.is_genuine_pump_fun_token = is_genuine_pump_fun_token
-            token_details.interacted_with = interacted_with
-            token_details.interacting_account = interacting_account
-            token_details.interaction_signature = interaction_signature
-            token_details.token_graduated_to_raydium = (is_genuine_pump_fun_token and interacted_with == "raydium")
+        if is_pump_authority(metadata):
+            await check_pump_token(session, token_details, metadata)
         
         return token_details, owner_program
 
     except Exception as e:
         logging.error(f"Unexpected error: {str(e)}")
-        return TokenDetails(
-            name="ERROR",
-            symbol="ERROR",
-            address=token_address,
-            owner_program="Error",
-            freeze_authority=None,
-            security_review="FAILED"
-        ), None
+        return error_token_details(token_address), None
 
 def process_token_data(account_data: Dict, token_address: str) -> Tuple[TokenDetails, str]:
     """Process the token data and return structured information"""
-    # Check if this is a system account
+    # Reject system and other non-token accounts with a single membership test
     owner_program = account_data.get('owner', 'N/A')
-    if owner_program == "11111111111111111111111111111111":
-        return TokenDetails(
-            name="N/A",
-            symbol="N/A",
-            address=token_address,
-            owner_program="System Program",
-            freeze_authority=None,
-            security_review="NOT_A_TOKEN"
-        ), owner_program
-
-    # Check if it's a valid token program
-    if owner_program not in [TOKEN_PROGRAM, TOKEN_2022_PROGRAM]:
+    if owner_program not in _TOKEN_PROGRAMS:
+        if owner_program == SYSTEM_PROGRAM:
+            owner_label = "System Program"
+        else:
+            owner_label = f"{owner_program} (Not a token program)"
         return TokenDetails(
             name="N/A",
             symbol="N/A",
             address=token_address,
-            owner_program=f"{owner_program} (Not a token program)",
+            owner_program=owner_label,
             freeze_authority=None,
             security_review="NOT_A_TOKEN"
         ), owner_program
 
     parsed_data = account_data.get("data", {}).get("parsed", {})
-    owner_label = get_owner_program_label(owner_program)
     
     info = parsed_data.get("info", {})
     freeze_authority = info.get('freezeAuthority')
@@ -514,7 +801,7 @@ def process_token_data(account_data: Dict, token_address: str) -> Tuple[TokenDet
         name=info.get('name', 'N/A'),
         symbol=info.get('symbol', 'N/A'),
         address=token_address,
-        owner_program=f"{owner_program} ({owner_label})",
+        owner_program=OWNER_DISPLAY.get(owner_program) or f"{owner_program} (Unknown Owner)",
         freeze_authority=freeze_authority,
         extensions=None
     )
@@ -531,26 +818,40 @@ def process_token_data(account_data: Dict, token_address: str) -> Tuple[TokenDet
 
     return base_details, owner_program
 
+def _apply_token_metadata(token_details: TokenDetails, extensions: Token2022Extensions, state: Dict) -> None:
+    token_details.name = state.get('name', token_details.name)
+    token_details.symbol = state.get('symbol', token_details.symbol)
+
+def _apply_permanent_delegate(token_details: TokenDetails, extensions: Token2022Extensions, state: Dict) -> None:
+    extensions.permanent_delegate = state.get("delegate")
+
+def _apply_transfer_fee_config(token_details: TokenDetails, extensions: Token2022Extensions, state: Dict) -> None:
+    extensions.transfer_fee = state.get("newerTransferFee", {}).get("transferFeeBasisPoints")
+
+def _apply_transfer_hook(token_details: TokenDetails, extensions: Token2022Extensions, state: Dict) -> None:
+    extensions.transfer_hook_authority = state.get("authority")
+
+def _apply_confidential_transfer_mint(token_details: TokenDetails, extensions: Token2022Extensions, state: Dict) -> None:
+    extensions.confidential_transfers_authority = state.get("authority")
+
+# Token-2022 extensions that affect the review, keyed by their jsonParsed type; others are skipped
+_EXTENSION_HANDLERS = {
+    "tokenMetadata": _apply_token_metadata,
+    "permanentDelegate": _apply_permanent_delegate,
+    "transferFeeConfig": _apply_transfer_fee_config,
+    "transferHook": _apply_transfer_hook,
+    "confidentialTransferMint": _apply_confidential_transfer_mint,
+}
+
 def process_token_2022_extensions(token_details: TokenDetails, info: Dict) -> TokenDetails:
     """Process Token 2022 specific extensions"""
     extensions_info = info.get("extensions", [])
     extensions = Token2022Extensions()
 
     for extension in extensions_info:
-        ext_type = extension.get("extension")
-        state = extension.get("state", {})
-
-        if ext_type == "tokenMetadata":
-            token_details.name = state.get('name', token_details.name)
-            token_details.symbol = state.get('symbol', token_details.symbol)
-        elif ext_type == "permanentDelegate":
-            extensions.permanent_delegate = state.get("delegate")
-        elif ext_type == "transferFeeConfig":
-            extensions.transfer_fee = state.get("newerTransferFee", {}).get("transferFeeBasisPoints")
-        elif ext_type == "transferHook":
-            extensions.transfer_hook_authority = state.get("authority")
-        elif ext_type == "confidentialTransferMint":
-            extensions.confidential_transfers_authority = state.get("authority")
+        handler = _EXTENSION_HANDLERS.get(extension.get("extension"))
+        if handler:
+            handler(token_details, extensions, extension.get("state", {}))
 
     token_details.extensions = extensions
 
@@ -567,30 +868,98 @@ def process_token_2022_extensions(token_details: TokenDetails, info: Dict) -> To
     logging.info(f"Token-2022 - Security review: {token_details.security_review}")
     return token_details
 
-async def process_tokens_concurrently(token_addresses: List[str], session: aiohttp.ClientSession) -> List[Dict]:
-    """Process multiple tokens concurrently with rate limiting"""
-    semaphore = asyncio.Semaphore(CONCURRENT_LIMIT)
-    total_tokens = len(token_addresses)
+async def iter_tokens_concurrently(token_addresses: List[str], session: aiohttp.ClientSession) -> AsyncIterator[Dict]:
+    """Process multiple tokens concurrently, yielding results in input order as they become available"""
+    # Pump.fun verification still makes many calls per token, so its concurrency
+    # adapts to the rate limiting the RPC endpoint reports
+    limiter = get_batcher(session).limiter
+    gate = AdmissionGate(limiter)
+    # Each address is analysed once; repeats in the input share its result
+    unique_addresses = list(dict.fromkeys(token_addresses))
+    total_tokens = len(unique_addresses)
+    # Malformed addresses would fail the whole getMultipleAccounts call they share, so they
+    # are reported as errors up front and never batched
+    invalid_addresses = {address for address in unique_addresses if not is_valid_address(address)}
+    if invalid_addresses:
+        unique_addresses = [address for address in unique_addresses if address not in invalid_addresses]
     
-    async def process_single_token(token_address: str, index: int) -> Dict:
-        async with semaphore:
-            logging.info(f"Processing token {index + 1}/{total_tokens} - {token_address}")
-            details, owner_program = await get_token_details_async(token_address, session)
-            if isinstance(details, TokenDetails):
-                return {
-                    'address': token_address,
-                    'status': 'success',
-                    **details.to_dict()
-                }
-            return {
-                'address': token_address,
-                'status': 'error',
-                'error': str(details)
-            }
+    # Mint accounts and metadata for every token first, then the recent
+    # transactions of all pump.fun candidates, so both passes go out as batches
+    accounts = await fetch_token_accounts(session, unique_addresses)
+    pump_candidates = [address for address, (_, metadata) in zip(unique_addresses, accounts) if is_pump_authority(metadata)]
+    recent_transactions = await fetch_recent_transactions(session, pump_candidates) if pump_candidates else {}
     
-    return await asyncio.gather(
-        *(process_single_token(addr, idx) for idx, addr in enumerate(token_addresses))
-    )
+    async def process_single_token(token_address: str, index: int, account_info: Optional[Dict], metadata: Optional[Dict]) -> Dict:
+        logging.info(f"Processing token {index + 1}/{total_tokens} - {token_address}")
+        try:
+            details, _ = build_token_details(token_address, account_info, metadata)
+            if is_pump_authority(metadata):
+                async with gate:
+                    penalties = limiter.penalties
+                    # Popped so each token's transactions are freed once checked
+                    await check_pump_token(session, details, metadata, recent_transactions.pop(token_address, None))
+                await gate.record(penalties)
+        except Exception as e:
+            logging.error(f"Unexpected error: {str(e)}")
+            details = error_token_details(token_address)
+        return {
+            'address': token_address,
+            'status': 'success',
+            **details.to_dict()
+        }
+    
+    async def report_invalid_token(token_address: str) -> Dict:
+        logging.error(f"Invalid token address: {token_address}")
+        return {
+            'address': token_address,
+            'status': 'success',
+            **error_token_details(token_address).to_dict()
+        }
+    
+    tasks = {
+        addr: asyncio.ensure_future(process_single_token(addr, idx, account_info, metadata))
+        for idx, (addr, (account_info, metadata)) in enumerate(zip(unique_addresses, accounts))
+    }
+    for addr in invalid_addresses:
+        tasks[addr] = asyncio.ensure_future(report_invalid_token(addr))
+    # Drop the fetched accounts so each one is freed once its token is done
+    del accounts
+    last_positions = {address: position for position, address in enumerate(token_addresses)}
+    try:
+        for position, address in enumerate(token_addresses):
+            if last_positions[address] == position:
+                # The task and its result are released once the last repeat is yielded
+                del last_positions[address]
+                result = await tasks.pop(address)
+            else:
+                # Earlier repeats get their own copy so callers can annotate each row independently
+                result = dict(await tasks[address])
+            yield result
+    finally:
+        # Stop outstanding work if the consumer gives up early
+        for task in tasks.values():
+            task.cancel()
+
+async def process_tokens_concurrently(token_addresses: List[str], session: aiohttp.ClientSession) -> List[Dict]:
+    """Process multiple tokens concurrently; their RPC calls are coalesced into batch requests"""
+    return [result async for result in iter_tokens_concurrently(token_addresses, session)]
+
+async def write_results_json(path: str, results: AsyncIterator[Dict]) -> int:
+    """Write results to a JSON array file as they arrive, laid out like json.dump(..., indent=2, ensure_ascii=False)"""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        async for result in results:
+            if orjson is not None:
+                item = orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
+            else:
+                # orjson writes non-ASCII text as UTF-8 rather than \u escapes
+                item = json.dumps(result, indent=2, ensure_ascii=False)
+            # Nest the item one level inside the array
+            f.write('[\n  ' if count == 0 else ',\n  ')
+            f.write(item.replace('\n', '\n  '))
+            count += 1
+        f.write('\n]' if count else '[]')
+    return count
 
 async def main():
     try:
@@ -619,12 +988,9 @@ async def main():
             ]
         )
         
-        async with aiohttp.ClientSession(timeout=SESSION_TIMEOUT) as session:
-            results = await process_tokens_concurrently(token_addresses, session)
-            
-            # Write outputs
-            with open(json_output, 'w') as f:
-                json.dump(results, f, indent=2)
+        async with create_session() as session:
+            # Results are written as they complete rather than held until the end
+            await write_results_json(json_output, iter_tokens_concurrently(token_addresses, session))
             
             logging.info(f"Analysis complete. Check {json_output} for results.")
             
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import spl_token_analysis as sta
+
+MINT = "So11111111111111111111111111111111111111112"
+
+
+class FakeBatcher:
+    """Answers batched RPC calls from canned responses and records every call"""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    async def call(self, method, params):
+        self.calls.append((method, params))
+        return self.responses(method, params)
+
+
+def run_with_batcher(batcher, coro_fn):
+    with mock.patch.object(sta, "get_batcher", return_value=batcher):
+        return asyncio.run(coro_fn())
+
+
+class FetchTokenAccountsTest(unittest.TestCase):
+    def setUp(self):
+        sta._no_metadata_since.clear()
+
+    def test_mint_without_metadata_is_not_looked_up_again(self):
+        def responses(method, params):
+            addresses = params[0]
+            if params[1]["encoding"] == "jsonParsed":
+                return {"value": [{"owner": sta.TOKEN_PROGRAM, "data": {}} for _ in addresses]}
+            return {"value": [None for _ in addresses]}
+
+        batcher = FakeBatcher(responses)
+        first = run_with_batcher(batcher, lambda: sta.fetch_token_accounts(object(), [MINT]))
+        metadata_calls = [params for _, params in batcher.calls if params[1]["encoding"] == "base64"]
+        self.assertEqual(len(metadata_calls), 1)
+        self.assertIsNone(first[0][1])
+
+        batcher.calls.clear()
+        run_with_batcher(batcher, lambda: sta.fetch_token_accounts(object(), [MINT]))
+        self.assertEqual([params[1]["encoding"] for _, params in batcher.calls], ["jsonParsed"])
+
+    def test_no_metadata_cache_is_bounded(self):
+        with mock.patch.object(sta, "NO_METADATA_MAX", 2):
+            for mint in ("a", "b", "c"):
+                sta.record_metadata_lookup(mint, {"value": None})
+        self.assertEqual(list(sta._no_metadata_since), ["b", "c"])
+
+
+class FetchRecentTransactionsTest(unittest.TestCase):
+    def test_shared_signature_is_fetched_once(self):
+        signatures = {"mint-a": ["shared", "only-a"], "mint-b": ["shared"]}
+
+        def responses(method, params):
+            if method == "getSignaturesForAddress":
+                return [{"signature": signature} for signature in signatures[params[0]]]
+            return {"signature": params[0]}
+
+        batcher = FakeBatcher(responses)
+        recent = run_with_batcher(batcher, lambda: sta.fetch_recent_transactions(object(), ["mint-a", "mint-b"]))
+        fetched = [params[0] for method, params in batcher.calls if method == "getTransaction"]
+        self.assertEqual(fetched, ["shared", "only-a"])
+        self.assertEqual([signature for signature, _ in recent["mint-b"]], ["shared"])
+        self.assertIs(recent["mint-a"][0][1], recent["mint-b"][0][1])
+
+
+class AdmissionGateTest(unittest.TestCase):
+    def test_penalty_before_first_task_keeps_limit(self):
+        async def scenario():
+            limiter = sta.TokenBucket(sta.RPC_RATE, sta.RPC_BURST)
+            gate = sta.AdmissionGate(limiter)
+            limiter.penalize(1.0)  # e.g. a 429 during the account prefetch
+            async with gate:
+                penalties = limiter.penalties
+            await gate.record(penalties)
+            return gate.limit
+
+        self.assertEqual(asyncio.run(scenario()), sta.CONCURRENT_LIMIT)
+
+    def test_one_penalty_halves_limit_once(self):
+        async def scenario():
+            limiter = sta.TokenBucket(sta.RPC_RATE, sta.RPC_BURST)
+            gate = sta.AdmissionGate(limiter)
+            starts = []
+            for _ in range(4):
+                await gate.__aenter__()
+                starts.append(limiter.penalties)
+            limiter.penalize(1.0)
+            for penalties in starts:
+                await gate.__aexit__(None, None, None)
+                await gate.record(penalties)
+            return gate.limit
+
+        self.assertEqual(asyncio.run(scenario()), sta.CONCURRENT_LIMIT // 2)
+
+
+class WriteResultsJsonTest(unittest.TestCase):
+    def write(self, results):
+        async def stream():
+            for result in results:
+                yield result
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.json")
+            count = asyncio.run(sta.write_results_json(path, stream()))
+            with open(path, encoding="utf-8") as f:
+                return count, f.read()
+
+    def test_non_ascii_names_match_with_and_without_orjson(self):
+        results = [{"address": MINT, "name": "Pépé 🐸", "symbol": "ПЕПЕ", "update_authority": None}]
+        expected = json.dumps(results, indent=2, ensure_ascii=False)
+        self.assertEqual(self.write(results), (1, expected))
+        with mock.patch.object(sta, "orjson", None):
+            self.assertEqual(self.write(results), (1, expected))
+
+    def test_empty_results(self):
+        self.assertEqual(self.write([]), (0, "[]"))
+
+
+if __name__ == "__main__":
+    unittest.main()